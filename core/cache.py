@@ -0,0 +1,262 @@
+"""
+Persistent response caches for generated docstrings.
+LLMCache stores API results on disk (SQLite or JSON) behind an in-memory LRU
+tier. SemanticCache reuses results for near-duplicate functions by embedding
+similarity.
+"""
+
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+@functools.cache
+def _get_numpy():
+    """Import numpy on first use; only the semantic cache needs it."""
+    import numpy
+    return numpy
+
+
+class LLMCache:
+    """Content-addressed cache for Gemini responses."""
+    
+    def __init__(self, backend="sqlite", path=".docstring_cache.db", ttl=None, memory_size=1024):
+        """
+        Initialize the cache.
+        
+        Args:
+            backend (str): Persistent storage backend ('sqlite' or 'json')
+            path (str): Location of the cache file
+            ttl (float): Optional lifetime of entries in seconds
+            memory_size (int): Maximum number of entries kept in memory
+        """
+        if backend not in ("sqlite", "json"):
+            raise ValueError(f"Unsupported cache backend: {backend}")
+        
+        self.backend = backend
+        self.path = path
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.stats = {"hits": 0, "misses": 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        
+        if backend == "sqlite":
+            # The generator is created on the UI thread but used from worker threads
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        else:
+            self._entries = self._load_json()
+    
+    def get(self, key):
+        """
+        Look up a cached value.
+        
+        Args:
+            key (str): Cache key
+            
+        Returns:
+            dict: Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            else:
+                entry = self._read(key)
+                if entry is not None:
+                    self._remember(key, entry)
+            
+            if entry is None or self._is_expired(entry[1]):
+                self.stats["misses"] += 1
+                return None
+            
+            self.stats["hits"] += 1
+            return json.loads(entry[0])
+    
+    def set(self, key, value):
+        """
+        Store a value in the cache.
+        
+        Args:
+            key (str): Cache key
+            value (dict): JSON-serializable value to store
+        """
+        entry = (json.dumps(value), time.time())
+        
+        with self._lock:
+            self._remember(key, entry)
+            self._write(key, entry)
+    
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._memory.clear()
+            if self.backend == "sqlite":
+                self._conn.execute("DELETE FROM cache")
+                self._conn.commit()
+            else:
+                self._entries = {}
+                self._save_json()
+    
+    def _remember(self, key, entry):
+        """Add an entry to the in-memory LRU tier."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+    
+    def _is_expired(self, created_at):
+        """Check whether an entry has outlived the TTL."""
+        return self.ttl is not None and time.time() - created_at > self.ttl
+    
+    def _read(self, key):
+        """Read an entry from persistent storage."""
+        if self.backend == "sqlite":
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            return tuple(row) if row else None
+        
+        entry = self._entries.get(key)
+        return tuple(entry) if entry else None
+    
+    def _write(self, key, entry):
+        """Write an entry to persistent storage."""
+        if self.backend == "sqlite":
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, entry[0], entry[1])
+            )
+            self._conn.commit()
+        else:
+            self._entries[key] = list(entry)
+            self._save_json()
+    
+    def _load_json(self):
+        """Load the JSON cache file if it exists."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_json(self):
+        """Write the JSON cache file."""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f)
+
+
+class SemanticCache:
+    """Embedding-similarity cache for near-duplicate functions."""
+    
+    def __init__(self, path=".docstring_semantic_cache", threshold=0.97):
+        """
+        Initialize the cache.
+        
+        Args:
+            path (str): Path prefix for the embeddings (.npy) and entries (.json) files
+            threshold (float): Minimum cosine similarity counted as a hit
+        """
+        self.matrix_path = path + ".npy"
+        self.entries_path = path + ".json"
+        self.threshold = threshold
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._matrix, self._scopes, self._results = self._load()
+    
+    def lookup(self, embedding, scope):
+        """
+        Find the cached result most similar to an embedding.
+        
+        Args:
+            embedding (list): Embedding of the function being generated
+            scope (str): Only entries stored under the same scope can match
+            
+        Returns:
+            dict: Cached result, or None if nothing is similar enough
+        """
+        np = _get_numpy()
+        query = self._normalize(embedding)
+        
+        with self._lock:
+            if not self._results or self._matrix.shape[1] != query.shape[0]:
+                self.stats["misses"] += 1
+                return None
+            
+            # Rows are unit vectors, so the dot product is the cosine similarity
+            scores = np.where(np.asarray(self._scopes) == scope, self._matrix @ query, -1.0)
+            best = int(np.argmax(scores))
+            
+            if scores[best] < self.threshold:
+                self.stats["misses"] += 1
+                return None
+            
+            self.stats["hits"] += 1
+            return dict(self._results[best])
+    
+    def add(self, embedding, scope, result):
+        """
+        Store a result with its embedding.
+        
+        Args:
+            embedding (list): Embedding of the function
+            scope (str): Scope the entry may be matched under
+            result (dict): JSON-serializable result to store
+        """
+        np = _get_numpy()
+        vector = self._normalize(embedding)
+        
+        with self._lock:
+            if self._results and self._matrix.shape[1] == vector.shape[0]:
+                self._matrix = np.vstack([self._matrix, vector])
+            else:
+                # First entry, or the embedding model changed
+                self._matrix = vector[np.newaxis, :]
+                self._scopes = []
+                self._results = []
+            
+            self._scopes.append(scope)
+            self._results.append(result)
+            self._save()
+    
+    def _normalize(self, embedding):
+        """Convert an embedding to a unit-length float32 vector."""
+        np = _get_numpy()
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def _load(self):
+        """Load saved embeddings and entries if they exist."""
+        np = _get_numpy()
+        empty = (np.zeros((0, 0), dtype=np.float32), [], [])
+        if not (os.path.exists(self.matrix_path) and os.path.exists(self.entries_path)):
+            return empty
+        
+        try:
+            matrix = np.load(self.matrix_path)
+            with open(self.entries_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        
+        if len(entries["scopes"]) != len(matrix):
+            return empty
+        return matrix, entries["scopes"], entries["results"]
+    
+    def _save(self):
+        """Write embeddings and entries to disk."""
+        _get_numpy().save(self.matrix_path, self._matrix)
+        with open(self.entries_path, 'w', encoding='utf-8') as f:
+            json.dump({"scopes": self._scopes, "results": self._results}, f)
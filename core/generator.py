@@ -3,8 +3,78 @@ Docstring Generator using Google's Gemini API.
 Generates docstrings in different styles (Google, NumPy, reST).
 """
 
-import google.generativeai as genai
-from utils.config import GEMINI_API_KEY, GEMINI_MODEL
+import ast
+import asyncio
+import functools
+import hashlib
+import json
+import random
+import re
+import textwrap
+import threading
+from collections import OrderedDict
+from itertools import islice
+
+from core.cache import LLMCache, SemanticCache
+from core.rate_limiter import TokenBucket
+from utils.config import (
+    GEMINI_API_KEY, GEMINI_MODEL, GEMINI_MAX_CONCURRENCY,
+    GEMINI_REQUESTS_PER_MINUTE, GEMINI_MAX_RETRIES, GEMINI_BATCH_SIZE,
+    CACHE_BACKEND, CACHE_PATH, CACHE_TTL, SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_PATH, SEMANTIC_CACHE_THRESHOLD, GEMINI_EMBEDDING_MODEL
+)
+
+# orjson parses large batched responses much faster than the stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# HTTP status codes worth retrying (rate limit and transient server errors)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Markdown code fences anywhere in the response
+_FENCE_RE = re.compile(r'```(?:python)?')
+
+# One leading and one trailing triple quote
+_QUOTE_RE = re.compile(r'^(?:"""|\'\'\')|(?:"""|\'\'\')$')
+
+# DOCSTRING:/FIXED_CODE:/ERRORS_FOUND: sections of a single-function response
+_RESPONSE_RE = re.compile(r'(.*?)FIXED_CODE:(.*?)(?:ERRORS_FOUND:(.*))?\Z', re.S)
+
+# Cache keys remembered per function body, so unchanged functions skip AST hashing
+CACHE_KEY_MEMO_SIZE = 1024
+
+# Force valid JSON output for multi-function prompts
+BATCH_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+DOCSTRING_REQUIREMENTS = """Requirements:
+1. Follow {style} style docstring format strictly
+2. Include purpose of the function
+3. Describe all parameters with their types
+4. Describe return type and value
+5. Add inline comments for complex logic if needed
+6. Follow PEP 257 conventions
+7. First line should be a brief summary ending with a period
+8. If multi-line, leave a blank line after the summary"""
+
+
+@functools.cache
+def _get_genai():
+    """Import google.generativeai on first use; it pulls in gRPC and protobuf."""
+    import google.generativeai as genai
+    return genai
+
+
+def _chunked(items, size):
+    """Yield successive lists of at most `size` items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
 
 
 class DocstringGenerator:
@@ -14,22 +84,98 @@ class DocstringGenerator:
         """Initialize the generator with API key."""
         self.api_key = api_key or GEMINI_API_KEY
         if self.api_key:
-            genai.configure(api_key=self.api_key)
+            genai = _get_genai()
+            # gRPC keeps one HTTP/2 connection open for all requests
+            genai.configure(api_key=self.api_key, transport="grpc")
             self.model = genai.GenerativeModel(GEMINI_MODEL)
         else:
             self.model = None
+        
+        # One long-lived event loop, so the async gRPC channel (bound to the
+        # loop it was created on) is reused across batches
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        # Shared by all requests so the RPM limit holds across calls; its
+        # lock binds to one event loop, so it is replaced with the loop
+        self.rate_limiter = None
+        self.cache = LLMCache(backend=CACHE_BACKEND, path=CACHE_PATH, ttl=CACHE_TTL)
+        self._cache_keys = OrderedDict()
+        self.semantic_cache = None
+        if SEMANTIC_CACHE_ENABLED:
+            self.semantic_cache = SemanticCache(path=SEMANTIC_CACHE_PATH, threshold=SEMANTIC_CACHE_THRESHOLD)
     
-    def generate_docstring(self, function_info, style="Google"):
+    def generate_docstring(self, function_info, style="Google", stream_callback=None):
         """
         Generate a docstring for a function.
         
         Args:
             function_info: FunctionInfo object containing function details
             style (str): Docstring style (Google, NumPy, or reST)
+            stream_callback (callable): Optional callback receiving the function
+                name and the partial docstring as the response streams in
+            
+        Returns:
+            dict: Contains 'docstring', 'fixed_code', and 'errors'
+        """
+        return self._run(self.agenerate_docstring(function_info, style, stream_callback=stream_callback))
+    
+    def _run(self, coro):
+        """Run a coroutine to completion on the generator's event loop."""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self.rate_limiter = TokenBucket(GEMINI_REQUESTS_PER_MINUTE)
+            return self._loop.run_until_complete(coro)
+    
+    async def agenerate_docstring(self, function_info, style="Google", rate_limiter=None,
+                                  stream_callback=None):
+        """
+        Generate a docstring for a function without blocking the event loop.
+        
+        Args:
+            function_info: FunctionInfo object containing function details
+            style (str): Docstring style (Google, NumPy, or reST)
+            rate_limiter (TokenBucket): Optional limiter awaited before each request,
+                defaults to the generator's shared one
+            stream_callback (callable): Optional callback receiving the function
+                name and the partial docstring as the response streams in
             
         Returns:
             dict: Contains 'docstring', 'fixed_code', and 'errors'
         """
+        cache_key = self._cache_key(function_info, style)
+        result = self._get_immediate_result(function_info, cache_key)
+        if result is not None:
+            return result
+        
+        # Reuse a result for a near-duplicate function
+        (result,), (embedding,) = await self._alookup_semantic([function_info], style)
+        if result is not None:
+            return result
+        
+        result = await self._agenerate_single(
+            function_info, style, rate_limiter or self._get_rate_limiter(), stream_callback
+        )
+        self._store_result(function_info, style, cache_key, embedding, result)
+        return result
+    
+    def _get_rate_limiter(self):
+        """Get the shared rate limiter, creating it for callers outside _run."""
+        if self.rate_limiter is None:
+            self.rate_limiter = TokenBucket(GEMINI_REQUESTS_PER_MINUTE)
+        return self.rate_limiter
+    
+    def _get_immediate_result(self, function_info, cache_key):
+        """
+        Get a result that does not require an API call.
+        
+        Args:
+            function_info: FunctionInfo object containing function details
+            cache_key (str): Cache key for the function
+            
+        Returns:
+            dict: Result dict, or None if the function must be sent to Gemini
+        """
         if not self.model:
             return {
                 "docstring": "Error: No API key configured",
@@ -46,21 +192,218 @@ class DocstringGenerator:
                 "status": "existing"
             }
         
+        # Reuse a previous response for an identical function
+        return self.cache.get(cache_key)
+    
+    async def _alookup_semantic(self, functions, style):
+        """
+        Look up near-duplicate functions in the semantic cache.
+        
+        Args:
+            functions (list): List of FunctionInfo objects
+            style (str): Docstring style
+            
+        Returns:
+            tuple: (results, embeddings) lists aligned with `functions`; a
+                result is None on a miss and an embedding is None if unavailable
+        """
+        misses = [None] * len(functions)
+        if not self.semantic_cache or not functions:
+            return misses, misses
+        
+        texts = [self._embedding_text(func) for func in functions]
+        try:
+            response = await _get_genai().embed_content_async(model=GEMINI_EMBEDDING_MODEL, content=texts)
+            embeddings = response["embedding"]
+        except Exception:
+            # Semantic caching is best effort; fall back to generating
+            return misses, misses
+        
+        results = []
+        for func, embedding in zip(functions, embeddings):
+            result = self.semantic_cache.lookup(embedding, self._semantic_scope(func, style))
+            if result is not None:
+                result["status"] = "semantic-cache"
+            results.append(result)
+        return results, embeddings
+    
+    def _store_result(self, function_info, style, cache_key, embedding, result):
+        """Save a freshly generated result in the exact and semantic caches."""
+        if result["status"] != "generated":
+            return
+        
+        self.cache.set(cache_key, result)
+        if self.semantic_cache and embedding is not None:
+            self.semantic_cache.add(embedding, self._semantic_scope(function_info, style), result)
+    
+    def _embedding_text(self, function_info):
+        """Build the text embedded for semantic cache lookups."""
+        args_str = ", ".join(arg['name'] for arg in function_info.args)
+        return f"{function_info.name}({args_str}) -> {function_info.returns}\n{function_info.body}"
+    
+    def _semantic_scope(self, function_info, style):
+        """
+        Build the scope a semantic cache entry may be matched under.
+        
+        The function name is part of the scope so that similar siblings
+        such as add/subtract never share a docstring.
+        """
+        return f"{GEMINI_MODEL}|{style}|{function_info.name}"
+    
+    async def _agenerate_single(self, function_info, style, rate_limiter=None, stream_callback=None):
+        """Request a docstring for one function with its own prompt."""
         # Create prompt for Gemini
         prompt = self._create_prompt(function_info, style)
         
+        on_text = None
+        if stream_callback:
+            def on_text(text):
+                stream_callback(function_info.name, self._partial_docstring(text))
+        
         try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_response(response.text, function_info)
+            response_text = await self._generate_with_retry(prompt, rate_limiter, on_text=on_text)
+            result = self._parse_response(response_text, function_info)
             result["status"] = "generated"
             return result
         except Exception as e:
-            return {
-                "docstring": f"Error generating docstring: {str(e)}",
-                "fixed_code": None,
-                "errors": [str(e)],
-                "status": "error"
-            }
+            return self._error_result(e)
+    
+    async def _agenerate_chunk(self, functions, style, rate_limiter=None, stream_callback=None):
+        """
+        Request docstrings for several functions with a single prompt.
+        
+        Functions missing from the batched response are retried individually.
+        
+        Args:
+            functions (list): List of FunctionInfo objects
+            style (str): Docstring style
+            rate_limiter (TokenBucket): Optional limiter awaited before each request
+            stream_callback (callable): Optional callback receiving a function name
+                and its docstring as soon as that part of the response arrives
+            
+        Returns:
+            list: Result dicts in the same order as `functions`
+        """
+        if len(functions) == 1:
+            return [await self._agenerate_single(functions[0], style, rate_limiter, stream_callback)]
+        
+        prompt = self._create_batch_prompt(functions, style)
+        
+        on_text = None
+        if stream_callback:
+            reported = set()
+            
+            def on_text(text):
+                # Close the array after the last complete object to read the
+                # items received so far; a cut inside a string just parses to nothing
+                partial = self._parse_batch_response(text[:text.rfind("}") + 1] + "]", len(functions))
+                for i, item in partial.items():
+                    if i not in reported:
+                        reported.add(i)
+                        stream_callback(functions[i].name, item["docstring"])
+        
+        try:
+            response_text = await self._generate_with_retry(
+                prompt, rate_limiter, generation_config=BATCH_GENERATION_CONFIG, on_text=on_text
+            )
+        except Exception as e:
+            return [self._error_result(e) for _ in functions]
+        
+        parsed = self._parse_batch_response(response_text, len(functions))
+        
+        results = []
+        for i, func in enumerate(functions):
+            result = parsed.get(i)
+            if result is None:
+                result = await self._agenerate_single(func, style, rate_limiter, stream_callback)
+            results.append(result)
+        return results
+    
+    def _error_result(self, error):
+        """Build the result dict for a failed API call."""
+        return {
+            "docstring": f"Error generating docstring: {str(error)}",
+            "fixed_code": None,
+            "errors": [str(error)],
+            "status": "error"
+        }
+    
+    def _cache_key(self, function_info, style):
+        """
+        Build a content hash identifying a generation request.
+        
+        The function is identified by its AST rather than its text, so
+        reformatting and comment edits still hit the cache. Keys are
+        remembered by a hash of the body text, so repeated runs over
+        unchanged functions do not parse them again.
+        """
+        body_hash = hashlib.blake2b(function_info.body.encode(), digest_size=16).digest()
+        memo_key = (body_hash, function_info.name, style)
+        cache_key = self._cache_keys.get(memo_key)
+        if cache_key is not None:
+            self._cache_keys.move_to_end(memo_key)
+            return cache_key
+        
+        payload = json.dumps({
+            "model": GEMINI_MODEL,
+            "style": style,
+            "name": function_info.name,
+            "ast": self._ast_fingerprint(function_info)
+        }, sort_keys=True)
+        cache_key = hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+        
+        self._cache_keys[memo_key] = cache_key
+        if len(self._cache_keys) > CACHE_KEY_MEMO_SIZE:
+            self._cache_keys.popitem(last=False)
+        return cache_key
+    
+    def _ast_fingerprint(self, function_info):
+        """Dump a function's AST without positions, comments or formatting."""
+        try:
+            # Methods are extracted with their class indentation
+            tree = ast.parse(textwrap.dedent(function_info.body))
+        except SyntaxError:
+            return function_info.body
+        return ast.dump(tree, annotate_fields=False)
+    
+    async def _generate_with_retry(self, prompt, rate_limiter=None, generation_config=None,
+                                   on_text=None):
+        """
+        Stream a Gemini response, retrying rate-limit and server errors with backoff.
+        
+        Args:
+            prompt (str): Prompt to send to the model
+            rate_limiter (TokenBucket): Optional limiter awaited before each attempt
+            generation_config (dict): Optional generation settings for this request
+            on_text (callable): Optional callback receiving the text received so far
+            
+        Returns:
+            str: Raw response text
+        """
+        delay = 1.0
+        for attempt in range(GEMINI_MAX_RETRIES + 1):
+            if rate_limiter:
+                await rate_limiter.acquire()
+            
+            try:
+                response = await self.model.generate_content_async(
+                    prompt, generation_config=generation_config, stream=True
+                )
+                
+                chunks = []
+                async for chunk in response:
+                    chunks.append(chunk.text)
+                    if on_text:
+                        on_text("".join(chunks))
+                return "".join(chunks)
+            except Exception as e:
+                retryable = getattr(e, "code", None) in RETRYABLE_STATUS_CODES
+                if not retryable or attempt == GEMINI_MAX_RETRIES:
+                    raise
+                
+                # Exponential backoff with jitter
+                await asyncio.sleep(delay + random.uniform(0, delay))
+                delay *= 2
     
     def _create_prompt(self, function_info, style):
         """Create a prompt for the Gemini API."""
@@ -75,15 +418,7 @@ Return Type: {function_info.returns}
 Function Code:
 {function_info.body}
 
-Requirements:
-1. Follow {style} style docstring format strictly
-2. Include purpose of the function
-3. Describe all parameters with their types
-4. Describe return type and value
-5. Add inline comments for complex logic if needed
-6. Follow PEP 257 conventions
-7. First line should be a brief summary ending with a period
-8. If multi-line, leave a blank line after the summary
+{DOCSTRING_REQUIREMENTS.format(style=style)}
 
 Also, if you find any obvious errors in the code (syntax, logic), provide a fixed version.
 
@@ -99,6 +434,89 @@ ERRORS_FOUND:
 """
         return prompt
     
+    def _create_batch_prompt(self, functions, style):
+        """Create a single prompt covering several functions."""
+        function_lines = []
+        for i, func in enumerate(functions):
+            function_json = json.dumps({
+                "id": i,
+                "name": func.name,
+                "args": func.args,
+                "returns": func.returns,
+                "body": func.body
+            })
+            function_lines.append(f"{i + 1}. {function_json}")
+        functions_str = "\n".join(function_lines)
+        
+        prompt = f"""Generate a {style} style docstring for each of these Python functions.
+
+Functions:
+{functions_str}
+
+{DOCSTRING_REQUIREMENTS.format(style=style)}
+
+Also, if you find any obvious errors in a function (syntax, logic), provide a fixed version.
+
+Respond with a JSON array containing one object per function:
+[{{"id": <function id>, "docstring": "<docstring text without surrounding quotes>", "fixed_code": "<fixed code, or null if no fixes needed>", "errors": ["<each error found>"]}}]
+"""
+        return prompt
+    
+    def _parse_batch_response(self, response_text, count):
+        """
+        Parse the JSON response to a batched prompt.
+        
+        Args:
+            response_text (str): Raw response text from the API
+            count (int): Number of functions in the batch
+            
+        Returns:
+            dict: Mapping of function id to result dict; unusable items are omitted
+        """
+        # Strip code fences and any prose around the JSON array
+        envelope = self._clean_docstring(response_text)
+        start, end = envelope.find("["), envelope.rfind("]")
+        
+        try:
+            items = _json_loads(envelope[start:end + 1])
+        except ValueError:
+            return {}
+        
+        if not isinstance(items, list):
+            return {}
+        
+        results = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            
+            item_id = item.get("id")
+            docstring = item.get("docstring")
+            if not isinstance(item_id, int) or not 0 <= item_id < count:
+                continue
+            if not isinstance(docstring, str) or not docstring.strip():
+                continue
+            
+            errors = item.get("errors") or []
+            if isinstance(errors, str):
+                errors = [errors]
+            
+            results[item_id] = {
+                "docstring": self._clean_docstring(docstring),
+                "fixed_code": item.get("fixed_code") or None,
+                "errors": [str(error) for error in errors],
+                "status": "generated"
+            }
+        
+        return results
+    
+    def _partial_docstring(self, response_text):
+        """Extract the docstring section from a partially streamed response."""
+        if "DOCSTRING:" not in response_text:
+            return ""
+        docstring_part = response_text.split("FIXED_CODE:")[0]
+        return self._clean_docstring(docstring_part.replace("DOCSTRING:", ""))
+    
     def _parse_response(self, response_text, function_info):
         """Parse the Gemini API response."""
         result = {
@@ -107,34 +525,22 @@ ERRORS_FOUND:
             "errors": []
         }
         
-        try:
-            # Split response into sections
-            sections = response_text.split("FIXED_CODE:")
-            if len(sections) >= 2:
-                docstring_part = sections[0].replace("DOCSTRING:", "").strip()
-                remaining = sections[1]
+        match = _RESPONSE_RE.match(response_text)
+        if match:
+            docstring_part, fixed_code, errors_found = match.groups()
+            result["docstring"] = self._clean_docstring(docstring_part.replace("DOCSTRING:", ""))
+            
+            if errors_found is not None:
+                fixed_code = fixed_code.strip()
+                errors_found = errors_found.strip()
                 
-                errors_split = remaining.split("ERRORS_FOUND:")
-                if len(errors_split) >= 2:
-                    fixed_code = errors_split[0].strip()
-                    errors_found = errors_split[1].strip()
-                    
-                    # Clean up the docstring
-                    docstring_part = self._clean_docstring(docstring_part)
-                    result["docstring"] = docstring_part
-                    
-                    if fixed_code and "No fixes needed" not in fixed_code:
-                        result["fixed_code"] = fixed_code
-                    if errors_found and "None" not in errors_found:
-                        result["errors"] = [errors_found]
-                else:
-                    result["docstring"] = self._clean_docstring(docstring_part)
-            else:
-                # Fallback: treat entire response as docstring
-                result["docstring"] = self._clean_docstring(response_text.strip())
-        except Exception as e:
-            # If parsing fails, just use the raw response
-            result["docstring"] = self._clean_docstring(response_text.strip())
+                if fixed_code and "No fixes needed" not in fixed_code:
+                    result["fixed_code"] = fixed_code
+                if errors_found and "None" not in errors_found:
+                    result["errors"] = [errors_found]
+        else:
+            # Fallback: treat entire response as docstring
+            result["docstring"] = self._clean_docstring(response_text)
         
         return result
     
@@ -148,30 +554,13 @@ ERRORS_FOUND:
         Returns:
             str: Cleaned docstring text
         """
-        # Remove markdown code fences
-        docstring_text = docstring_text.replace("```python", "")
-        docstring_text = docstring_text.replace("```", "")
-        
-        # Remove multiple triple quotes at start/end
-        docstring_text = docstring_text.strip()
-        
-        # Remove leading/trailing triple quotes if present
-        if docstring_text.startswith('"""'):
-            docstring_text = docstring_text[3:]
-        if docstring_text.endswith('"""'):
-            docstring_text = docstring_text[:-3]
-        
-        if docstring_text.startswith("'''"):
-            docstring_text = docstring_text[3:]
-        if docstring_text.endswith("'''"):
-            docstring_text = docstring_text[:-3]
-        
-        # Clean up extra whitespace
-        docstring_text = docstring_text.strip()
+        # Remove markdown code fences, then surrounding triple quotes
+        docstring_text = _FENCE_RE.sub('', docstring_text).strip()
+        docstring_text = _QUOTE_RE.sub('', docstring_text).strip()
         
         return docstring_text
     
-    def generate_batch(self, functions, style="Google", progress_callback=None):
+    def generate_batch(self, functions, style="Google", progress_callback=None, stream_callback=None):
         """
         Generate docstrings for multiple functions.
         
@@ -179,18 +568,83 @@ ERRORS_FOUND:
             functions (list): List of FunctionInfo objects
             style (str): Docstring style
             progress_callback (callable): Optional callback for progress updates
+            stream_callback (callable): Optional callback for partial docstrings
+            
+        Returns:
+            dict: Mapping of function names to generated docstrings
+        """
+        return self._run(self.agenerate_batch(functions, style, progress_callback, stream_callback))
+    
+    async def agenerate_batch(self, functions, style="Google", progress_callback=None,
+                              stream_callback=None):
+        """
+        Generate docstrings for multiple functions concurrently.
+        
+        Functions are packed GEMINI_BATCH_SIZE to a prompt. Requests are
+        limited to GEMINI_MAX_CONCURRENCY in flight and throttled to
+        GEMINI_REQUESTS_PER_MINUTE.
+        
+        Args:
+            functions (list): List of FunctionInfo objects
+            style (str): Docstring style
+            progress_callback (callable): Optional callback for progress updates
+            stream_callback (callable): Optional callback receiving a function name
+                and its partial docstring while the responses stream in
             
         Returns:
             dict: Mapping of function names to generated docstrings
         """
-        results = {}
         total = len(functions)
+        ordered_results = [None] * total
         
-        for i, func in enumerate(functions):
-            result = self.generate_docstring(func, style)
-            results[func.name] = result
+        # Resolve existing and cached docstrings without calling the generation API
+        pending = []
+        for index, func in enumerate(functions):
+            cache_key = self._cache_key(func, style)
+            result = self._get_immediate_result(func, cache_key)
+            if result is None:
+                pending.append((index, func, cache_key))
+            else:
+                ordered_results[index] = result
+        
+        # Resolve near-duplicates of previously generated functions
+        semantic_results, embeddings = await self._alookup_semantic(
+            [func for _, func, _ in pending], style
+        )
+        still_pending = []
+        for (index, func, cache_key), result, embedding in zip(pending, semantic_results, embeddings):
+            if result is None:
+                still_pending.append((index, func, cache_key, embedding))
+            else:
+                ordered_results[index] = result
+        pending = still_pending
+        
+        completed = total - len(pending)
+        if progress_callback and completed:
+            progress_callback(completed, total)
+        
+        semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+        rate_limiter = self._get_rate_limiter()
+        
+        async def generate_chunk(chunk):
+            async with semaphore:
+                chunk_functions = [func for _, func, _, _ in chunk]
+                chunk_results = await self._agenerate_chunk(
+                    chunk_functions, style, rate_limiter, stream_callback
+                )
+                return chunk, chunk_results
+        
+        tasks = [generate_chunk(chunk) for chunk in _chunked(pending, GEMINI_BATCH_SIZE)]
+        
+        for task in asyncio.as_completed(tasks):
+            chunk, chunk_results = await task
+            for (index, func, cache_key, embedding), result in zip(chunk, chunk_results):
+                ordered_results[index] = result
+                self._store_result(func, style, cache_key, embedding, result)
             
+            completed += len(chunk)
             if progress_callback:
-                progress_callback(i + 1, total)
+                progress_callback(completed, total)
         
-        return results
\ No newline at end of file
+        # Keep results in source order regardless of completion order
+        return {func.name: result for func, result in zip(functions, ordered_results)}
@@ -5,18 +5,51 @@ Extracts functions and their metadata from Python source code.
 
 import ast
 import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 
 class FunctionInfo:
     """Stores information about a parsed function."""
     
-    def __init__(self, name, args, returns, lineno, existing_docstring, body):
+    def __init__(self, name, args, returns, lineno, existing_docstring, body,
+                 docstring_end_lineno=None, end_lineno=None, body_lineno=None, body_col_offset=None):
         self.name = name
         self.args = args
         self.returns = returns
         self.lineno = lineno
         self.existing_docstring = existing_docstring
         self.body = body
+        # Last line of the existing docstring, None if there is none
+        self.docstring_end_lineno = docstring_end_lineno
+        # Last line of the definition, so callers can slice the source
+        # themselves instead of holding on to `body`
+        self.end_lineno = end_lineno
+        # Position of the first body statement (the docstring, if there is
+        # one), where a new docstring goes
+        self.body_lineno = body_lineno
+        self.body_col_offset = body_col_offset
+
+
+def _parse_one(path):
+    """
+    Parse a single file in a worker process.
+    
+    Args:
+        path (str): Path to a Python source file
+        
+    Returns:
+        tuple: (path, functions, errors, accuracy)
+    """
+    parser = CodeParser()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            source_code = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return path, [], [f"Read Error: {str(e)}"], 0.0
+    
+    functions = parser.parse_code(source_code)
+    return path, functions, parser.errors, parser.accuracy
 
 
 class CodeParser:
@@ -26,6 +59,8 @@ class CodeParser:
         self.functions = []
         self.errors = []
         self.accuracy = 0.0
+        self.tree = None
+        self._source_lines = []
     
     def parse_code(self, source_code):
         """
@@ -34,34 +69,158 @@ class CodeParser:
         Args:
             source_code (str): The Python source code to parse
             
+        Returns:
+            list: List of FunctionInfo objects
+        """
+        try:
+            tree = ast.parse(source_code)
+        except SyntaxError as e:
+            error = f"Syntax Error: {str(e)}"
+        except Exception as e:
+            error = f"Parse Error: {str(e)}"
+        else:
+            return self.parse_tree(tree, source_code)
+        
+        self.functions = []
+        self.errors = [error]
+        self.tree = None
+        self.accuracy = 0.0
+        return []
+    
+    def parse_tree(self, tree, source_code):
+        """
+        Extract function information from an already parsed module.
+        
+        Args:
+            tree (ast.Module): Parsed tree of `source_code`
+            source_code (str): The Python source code the tree was parsed from
+            
         Returns:
             list: List of FunctionInfo objects
         """
         self.functions = []
         self.errors = []
+        self.tree = tree
         
         try:
-            tree = ast.parse(source_code)
-            self._extract_functions(tree, source_code)
+            # Split once here rather than once per function
+            self._source_lines = source_code.split('\n')
+            self._visit(tree)
             self.accuracy = 100.0 if not self.errors else 95.0
             return self.functions
-        except SyntaxError as e:
-            self.errors.append(f"Syntax Error: {str(e)}")
-            self.accuracy = 0.0
-            return []
         except Exception as e:
             self.errors.append(f"Parse Error: {str(e)}")
             self.accuracy = 0.0
             return []
+        finally:
+            self._source_lines = []
+    
+    def parse_tree_report(self, tree, source_code):
+        """
+        Summarize an already parsed module as plain dicts for display.
+        
+        Args:
+            tree (ast.Module): Parsed tree of `source_code`
+            source_code (str): The Python source code the tree was parsed from
+            
+        Returns:
+            dict: 'success' and, on failure, 'error'; on success also
+                'functions' and 'classes' (lists of item dicts in source
+                order, each with its 'line'/'line_end' range rather than a
+                copy of its source), 'accuracy', 'total_items' and
+                'items_with_docstrings'
+        """
+        functions = self.parse_tree(tree, source_code)
+        if self.errors:
+            return {"success": False, "error": "; ".join(self.errors)}
+        
+        function_items = []
+        for func in functions:
+            params = []
+            for arg in func.args:
+                param = {"name": arg["name"]}
+                if arg["type"] is not None:
+                    param["type"] = arg["type"]
+                params.append(param)
+            
+            function_items.append({
+                "name": func.name,
+                "line": func.lineno,
+                "line_end": func.end_lineno,
+                "has_docstring": bool(func.existing_docstring),
+                "params": params,
+                "return_type": func.returns
+            })
+        
+        class_nodes = sorted(
+            (node for node in ast.walk(tree) if isinstance(node, ast.ClassDef)),
+            key=lambda node: node.lineno
+        )
+        class_items = [
+            {
+                "name": node.name,
+                "line": node.lineno,
+                "line_end": node.end_lineno,
+                "has_docstring": bool(ast.get_docstring(node))
+            }
+            for node in class_nodes
+        ]
+        
+        items = function_items + class_items
+        return {
+            "success": True,
+            "functions": function_items,
+            "classes": class_items,
+            "accuracy": self.accuracy,
+            "total_items": len(items),
+            "items_with_docstrings": sum(1 for item in items if item["has_docstring"])
+        }
+    
+    def parse_files(self, paths):
+        """
+        Parse several Python files in parallel worker processes.
+        
+        Afterwards `functions` and `errors` hold the combined results, so
+        coverage stats describe the whole set of files.
+        
+        Args:
+            paths (list): Paths to Python source files
+            
+        Returns:
+            dict: Mapping of file path to its list of FunctionInfo objects
+        """
+        self.functions = []
+        self.errors = []
+        results = {}
+        accuracies = []
+        
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for path, functions, errors, accuracy in executor.map(_parse_one, paths, chunksize=4):
+                results[path] = functions
+                self.functions.extend(functions)
+                self.errors.extend(f"{path}: {error}" for error in errors)
+                accuracies.append(accuracy)
+        
+        self.accuracy = sum(accuracies) / len(accuracies) if accuracies else 0.0
+        return results
     
-    def _extract_functions(self, tree, source_code):
-        """Extract all function definitions from AST."""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                func_info = self._get_function_info(node, source_code)
+    def _visit(self, node):
+        """
+        Extract function definitions below a node in source order.
+        
+        Expressions are never descended into, since no definition can sit
+        inside one. Everything else is, which reaches methods, nested
+        functions and definitions inside if/try/with blocks, except
+        handlers and match cases.
+        """
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                func_info = self._get_function_info(child)
                 self.functions.append(func_info)
+            if not isinstance(child, ast.expr):
+                self._visit(child)
     
-    def _get_function_info(self, node, source_code):
+    def _get_function_info(self, node):
         """Extract detailed information from a function node."""
         # Get function name
         name = node.name
@@ -78,9 +237,10 @@ class CodeParser:
         
         # Get existing docstring
         existing_docstring = ast.get_docstring(node)
+        docstring_end_lineno = node.body[0].end_lineno if existing_docstring is not None else None
         
         # Get function body (for inline comments)
-        body = self._get_function_body(node, source_code)
+        body = self._get_function_body(node)
         
         return FunctionInfo(
             name=name,
@@ -88,31 +248,47 @@ class CodeParser:
             returns=returns,
             lineno=node.lineno,
             existing_docstring=existing_docstring,
-            body=body
+            body=body,
+            docstring_end_lineno=docstring_end_lineno,
+            end_lineno=node.end_lineno,
+            body_lineno=node.body[0].lineno,
+            body_col_offset=node.body[0].col_offset
         )
     
     def _get_annotation(self, annotation):
         """Get type annotation as string."""
         if annotation is None:
             return None
+        
+        # Format the common shapes directly; ast.unparse builds a full
+        # unparser visitor for every call
+        node_type = type(annotation)
+        if node_type is ast.Name:
+            return annotation.id
+        if node_type is ast.Constant and (annotation.value is None or type(annotation.value) is str):
+            return repr(annotation.value)
+        if node_type is ast.Attribute and type(annotation.value) in (ast.Name, ast.Attribute):
+            return f"{self._get_annotation(annotation.value)}.{annotation.attr}"
+        if node_type is ast.Subscript and type(annotation.value) in (ast.Name, ast.Attribute):
+            index = annotation.slice
+            value_str = self._get_annotation(annotation.value)
+            if type(index) is not ast.Tuple:
+                return f"{value_str}[{self._get_annotation(index)}]"
+            if len(index.elts) > 1:
+                return f"{value_str}[{', '.join(self._get_annotation(elt) for elt in index.elts)}]"
+        
         try:
             return ast.unparse(annotation)
         except:
             return str(annotation)
     
-    def _get_function_body(self, node, source_code):
+    def _get_function_body(self, node):
         """Extract the function body as text."""
         try:
-            lines = source_code.split('\n')
             start_line = node.lineno - 1
+            end_line = node.end_lineno
             
-            # Find the end of the function
-            end_line = start_line + 1
-            if node.body:
-                last_stmt = node.body[-1]
-                end_line = last_stmt.end_lineno if hasattr(last_stmt, 'end_lineno') else start_line + 10
-            
-            body_lines = lines[start_line:end_line]
+            body_lines = self._source_lines[start_line:end_line]
             return '\n'.join(body_lines)
         except:
             return ""
@@ -0,0 +1,38 @@
+"""
+Token-bucket rate limiter for Gemini API requests.
+Keeps concurrent batch generation under the per-minute request quota.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token bucket that releases requests at a steady rate."""
+    
+    def __init__(self, requests_per_minute):
+        """
+        Initialize the bucket.
+        
+        Args:
+            requests_per_minute (int): Maximum sustained request rate
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request token is available, then consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
@@ -2,9 +2,77 @@
 Docstring Validator using pydocstyle for PEP 257 compliance.
 """
 
-import tempfile
+import ast
 import os
-from pydocstyle import check
+from concurrent.futures import ProcessPoolExecutor
+
+# Definitions that can need a docstring
+_DEFINITION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+# Missing-docstring codes are reported as errors, everything else as warnings
+_ERROR_CODES = frozenset(('D100', 'D101', 'D102', 'D103'))
+
+# Human-readable messages for pydocstyle codes
+_ISSUE_MESSAGES = {
+    'D100': 'Missing docstring in public module',
+    'D101': 'Missing docstring in public class',
+    'D102': 'Missing docstring in public method',
+    'D103': 'Missing docstring in public function',
+    'D200': 'One-line docstring should fit on one line',
+    'D201': 'No blank lines allowed before function docstring',
+    'D202': 'No blank lines allowed after function docstring',
+    'D203': 'One blank line required before class docstring',
+    'D204': 'One blank line required after class docstring',
+    'D205': 'One blank line required between summary and description',
+    'D206': 'Docstring should be indented with spaces, not tabs',
+    'D207': 'Docstring is under-indented',
+    'D208': 'Docstring is over-indented',
+    'D209': 'Multi-line docstring closing quotes should be on a separate line',
+    'D210': 'No whitespaces allowed surrounding docstring text',
+    'D211': 'No blank lines allowed before class docstring',
+    'D212': 'Multi-line docstring summary should start at the first line',
+    'D213': 'Multi-line docstring summary should start at the second line',
+    'D300': 'Use triple double quotes for docstrings',
+    'D301': 'Use r""" if any backslashes in a docstring',
+    'D400': 'First line should end with a period',
+    'D401': 'First line should be in imperative mood',
+    'D402': 'First line should not be the function signature',
+    'D403': 'First word of the first line should be capitalized',
+    'D404': 'First word of the docstring should not be "This"',
+    'D405': 'Section name should be properly capitalized',
+    'D406': 'Section name should end with a newline',
+    'D407': 'Missing dashed underline after section',
+    'D408': 'Section underline should be on the line after the section name',
+    'D409': 'Section underline should match the length of its name',
+    'D410': 'Missing blank line after section',
+    'D411': 'Missing blank line before section',
+    'D412': 'No blank lines allowed between section header and content',
+    'D413': 'Missing blank line after last section',
+    'D414': 'Section has no content',
+    'D415': 'First line should end with a period, question mark, or exclamation point',
+    'D416': 'Section name should end with a colon',
+    'D417': 'Missing argument descriptions in the docstring'
+}
+
+
+def _validate_one(path):
+    """
+    Validate a single file in a worker process.
+    
+    Args:
+        path (str): Path to a Python source file
+        
+    Returns:
+        tuple: (path, validation results)
+    """
+    validator = DocstringValidator()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            source_code = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return path, validator._error_result(e)
+    
+    return path, validator.validate_code(source_code)
 
 
 class DocstringValidator:
@@ -15,112 +83,151 @@ class DocstringValidator:
         self.warnings = []
         self.compliant_count = 0
     
-    def validate_code(self, source_code, generated_docstrings=None):
+    def validate_code(self, source_code, generated_docstrings=None, pre_parsed_tree=None):
         """
         Validate docstrings in Python code against PEP 257.
         
         Args:
             source_code (str): The Python source code
             generated_docstrings (dict): Optional dict of function -> docstring mapping
+            pre_parsed_tree (ast.Module): Optional tree of `source_code`, reused
+                to count definitions instead of parsing again
             
         Returns:
             dict: Validation results with errors, warnings, and compliance stats
         """
+        # pydocstyle is only loaded once something is actually validated
+        from pydocstyle.checker import ConventionChecker
+        from pydocstyle.violations import conventions
+        
         try:
             # If we have generated docstrings, insert them into the code
             if generated_docstrings:
-                source_code = self._insert_docstrings(source_code, generated_docstrings)
+                source_code = self._insert_docstrings(source_code, generated_docstrings, pre_parsed_tree)
             
-            # Write to temporary file for pydocstyle
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
-                f.write(source_code)
-                temp_path = f.name
+            # Run pydocstyle checks on the in-memory source
+            issues = [
+                issue for issue in ConventionChecker().check_source(source_code, '<generated>')
+                if issue.code in conventions.pep257
+            ]
             
-            try:
-                # Run pydocstyle checks
-                issues = list(check([temp_path]))
-                
-                # Categorize issues
-                errors = []
-                warnings = []
-                
-                for issue in issues:
-                    issue_dict = {
-                        "code": issue.code,
-                        "message": issue.message,
-                        "line": issue.line,
-                        "definition": str(issue.definition) if issue.definition else "Unknown"
-                    }
-                    
-                    # Categorize by severity
-                    if issue.code in ['D100', 'D101', 'D102', 'D103']:
-                        errors.append(issue_dict)
-                    else:
-                        warnings.append(issue_dict)
-                
-                self.errors = errors
-                self.warnings = warnings
-                
-                # Calculate compliance
-                total_issues = len(issues)
-                total_functions = source_code.count('def ')
-                self.compliant_count = max(0, total_functions - len(errors))
-                
-                return self._format_results()
+            # Categorize issues
+            errors = []
+            warnings = []
+            
+            for issue in issues:
+                issue_dict = {
+                    "code": issue.code,
+                    "message": issue.message,
+                    "line": issue.line,
+                    "definition": str(issue.definition) if issue.definition else "Unknown"
+                }
                 
-            finally:
-                # Clean up temp file
-                try:
-                    if os.path.exists(temp_path):
-                        os.remove(temp_path)
-                except:
-                    pass
+                # Categorize by severity
+                if issue.code in _ERROR_CODES:
+                    errors.append(issue_dict)
+                else:
+                    warnings.append(issue_dict)
+            
+            self.errors = errors
+            self.warnings = warnings
+            
+            # Calculate compliance
+            total_issues = len(issues)
+            # Inserting docstrings does not change the definitions, so the
+            # tree of the original source can be reused
+            tree = pre_parsed_tree if pre_parsed_tree is not None else ast.parse(source_code)
+            total_definitions = sum(1 for node in ast.walk(tree) if isinstance(node, _DEFINITION_TYPES))
+            self.compliant_count = max(0, total_definitions - len(errors))
+            
+            return self._format_results()
                     
         except Exception as e:
             # Return error result instead of crashing
-            return {
-                "errors": [{"code": "ERROR", "message": f"Validation error: {str(e)}", "line": 0, "definition": ""}],
-                "warnings": [],
+            return self._error_result(e)
+    
+    def validate_from_tree(self, tree, source_code, generated_docstrings=None):
+        """
+        Validate code that has already been parsed, e.g. by CodeParser.
+        
+        Args:
+            tree (ast.Module): Parsed tree of `source_code`
+            source_code (str): The Python source code
+            generated_docstrings (dict): Optional dict of function -> docstring mapping
+            
+        Returns:
+            dict: Validation results with errors, warnings, and compliance stats
+        """
+        return self.validate_code(source_code, generated_docstrings, pre_parsed_tree=tree)
+    
+    def validate_files(self, paths):
+        """
+        Validate several Python files in parallel worker processes.
+        
+        Args:
+            paths (list): Paths to Python source files
+            
+        Returns:
+            dict: Mapping of file path to its validation results
+        """
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return dict(executor.map(_validate_one, paths, chunksize=4))
+    
+    def _error_result(self, error):
+        """Build the validation result for a file that could not be checked."""
+        return {
+            "errors": [{"code": "ERROR", "message": f"Validation error: {str(error)}", "line": 0, "definition": ""}],
+            "warnings": [],
+            "compliant": 0,
+            "total_issues": 1,
+            "summary": {
                 "compliant": 0,
-                "total_issues": 1,
-                "summary": {
-                    "compliant": 0,
-                    "warnings": 0,
-                    "errors": 1
-                }
+                "warnings": 0,
+                "errors": 1
             }
+        }
     
-    def _insert_docstrings(self, source_code, docstrings):
-        """Insert generated docstrings into source code."""
-        lines = source_code.split('\n')
-        result_lines = []
-        i = 0
+    def _insert_docstrings(self, source_code, docstrings, tree=None):
+        """
+        Insert generated docstrings into source code.
         
-        while i < len(lines):
-            line = lines[i]
-            result_lines.append(line)
-            
-            # Check if this is a function definition
-            if line.strip().startswith('def '):
-                func_name = line.split('def ')[1].split('(')[0].strip()
-                
-                # If we have a docstring for this function
-                if func_name in docstrings:
-                    docstring = docstrings[func_name].get('docstring', '')
-                    if docstring:
-                        # Add indentation
-                        indent = len(line) - len(line.lstrip()) + 4
-                        indent_str = ' ' * indent
-                        
-                        # Add docstring
-                        result_lines.append(indent_str + '"""')
-                        for doc_line in docstring.split('\n'):
-                            result_lines.append(indent_str + doc_line)
-                        result_lines.append(indent_str + '"""')
+        Headers are located with the AST, so signatures spanning several
+        lines or containing parentheses of their own are handled.
+        
+        Args:
+            source_code (str): The Python source code
+            docstrings (dict): Function name -> {'docstring': ...} mapping
+            tree (ast.Module): Optional parsed tree of `source_code`
             
-            i += 1
+        Returns:
+            str: The source code with the docstrings inserted
+        """
+        if tree is None:
+            tree = ast.parse(source_code)
+        lines = source_code.split('\n')
         
-        return '\n'.join(result_lines)
+        # Line index each docstring goes in front of, with its indentation
+        insertions = []
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            docstring = docstrings.get(node.name, {}).get('docstring', '')
+            first = node.body[0]
+            # A body on the header line leaves no line to insert before
+            if not docstring or first.lineno == node.lineno:
+                continue
+            indent_str = lines[first.lineno - 1][:first.col_offset]
+            insertions.append((first.lineno - 1, indent_str, docstring))
+        
+        # Insert bottom-up so earlier line indexes stay valid
+        for index, indent_str, docstring in sorted(insertions, key=lambda item: item[0], reverse=True):
+            lines[index:index] = [
+                indent_str + '"""',
+                *(indent_str + doc_line for doc_line in docstring.split('\n')),
+                indent_str + '"""'
+            ]
+        
+        return '\n'.join(lines)
     
     def _format_results(self):
         """Format validation results."""
@@ -163,51 +270,11 @@ class DocstringValidator:
                 "code": code,
                 "message": message,
                 "count": len(issues),
-                "severity": "error" if code in ['D100', 'D101', 'D102', 'D103'] else "warning"
+                "severity": "error" if code in _ERROR_CODES else "warning"
             })
         
         return status_items
     
     def _get_issue_message(self, code):
         """Get human-readable message for error code."""
-        messages = {
-            'D100': 'Missing docstring in public module',
-            'D101': 'Missing docstring in public class',
-            'D102': 'Missing docstring in public method',
-            'D103': 'Missing docstring in public function',
-            'D200': 'One-line docstring should fit on one line',
-            'D201': 'No blank lines allowed before function docstring',
-            'D202': 'No blank lines allowed after function docstring',
-            'D203': 'One blank line required before class docstring',
-            'D204': 'One blank line required after class docstring',
-            'D205': 'One blank line required between summary and description',
-            'D206': 'Docstring should be indented with spaces, not tabs',
-            'D207': 'Docstring is under-indented',
-            'D208': 'Docstring is over-indented',
-            'D209': 'Multi-line docstring closing quotes should be on a separate line',
-            'D210': 'No whitespaces allowed surrounding docstring text',
-            'D211': 'No blank lines allowed before class docstring',
-            'D212': 'Multi-line docstring summary should start at the first line',
-            'D213': 'Multi-line docstring summary should start at the second line',
-            'D300': 'Use triple double quotes for docstrings',
-            'D301': 'Use r""" if any backslashes in a docstring',
-            'D400': 'First line should end with a period',
-            'D401': 'First line should be in imperative mood',
-            'D402': 'First line should not be the function signature',
-            'D403': 'First word of the first line should be capitalized',
-            'D404': 'First word of the docstring should not be "This"',
-            'D405': 'Section name should be properly capitalized',
-            'D406': 'Section name should end with a newline',
-            'D407': 'Missing dashed underline after section',
-            'D408': 'Section underline should be on the line after the section name',
-            'D409': 'Section underline should match the length of its name',
-            'D410': 'Missing blank line after section',
-            'D411': 'Missing blank line before section',
-            'D412': 'No blank lines allowed between section header and content',
-            'D413': 'Missing blank line after last section',
-            'D414': 'Section has no content',
-            'D415': 'First line should end with a period, question mark, or exclamation point',
-            'D416': 'Section name should end with a colon',
-            'D417': 'Missing argument descriptions in the docstring'
-        }
-        return messages.get(code, f'PEP 257 violation: {code}')
\ No newline at end of file
+        return _ISSUE_MESSAGES.get(code, f'PEP 257 violation: {code}')
\ No newline at end of file
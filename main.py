@@ -4,12 +4,14 @@ Run this file to start the application.
 """
 
 import sys
-from PyQt5.QtWidgets import QApplication
-from ui.main_window import MainWindow
 
 
 def main():
     """Start the Docstring Generator application."""
+    # Qt and the UI are only imported when the app is launched
+    from PyQt5.QtWidgets import QApplication
+    from ui.main_window import MainWindow
+    
     app = QApplication(sys.argv)
     app.setApplicationName("Docstring Generator Pro")
     
@@ -3,6 +3,12 @@ Sample Python file for testing Python Docstring Generator.
 This file contains various functions without docstrings.
 """
 
+import math
+import re
+
+# Anything str.isalnum() rejects, including underscores
+_NON_ALNUM_RE = re.compile(r'[\W_]+')
+
 
 def calculate_area(length, width):
     """Calculate area of rectangle."""
@@ -19,24 +25,17 @@ def fahrenheit_to_celsius(fahrenheit):
 
 
 def find_maximum(numbers):
-    if not numbers:
-        return None
-    max_num = numbers[0]
-    for num in numbers:
-        if num > max_num:
-            max_num = num
-    return max_num
+    return max(numbers) if numbers else None
 
 
 def is_palindrome(text):
-    cleaned = text.lower().replace(" ", "")
+    cleaned = _NON_ALNUM_RE.sub('', text.lower())
     return cleaned == cleaned[::-1]
 
 
 def factorial(n):
-    if n == 0 or n == 1:
-        return 1
-    result = 1
-    for i in range(2, n + 1):
-        result *= i
-    return result
\ No newline at end of file
+    if not isinstance(n, int):
+        raise TypeError("n must be an integer.")
+    if n < 0:
+        raise ValueError("n must be a non-negative integer.")
+    return math.factorial(n)
\ No newline at end of file
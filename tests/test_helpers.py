@@ -0,0 +1,80 @@
+"""Tests for utils.helpers."""
+
+import ast
+import textwrap
+import unittest
+
+from core.parser import CodeParser
+from utils.helpers import insert_docstrings_into_code
+
+
+class InsertDocstringsIntoCodeTest(unittest.TestCase):
+    """Where insert_docstrings_into_code puts docstrings."""
+
+    def insert(self, source, names):
+        functions = CodeParser().parse_code(source)
+        docstrings = {
+            name: {'docstring': f'New {name}.', 'status': 'generated'}
+            for name in names
+        }
+        return insert_docstrings_into_code(source, functions, docstrings)
+
+    def docstrings_of(self, source):
+        return {
+            node.name: ast.get_docstring(node)
+            for node in ast.walk(ast.parse(source))
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        }
+
+    def test_multiline_signature_with_existing_docstring(self):
+        source = textwrap.dedent('''
+            def f(
+                a,
+                b,
+            ):
+                """Old."""
+                return a
+        ''')
+        result = self.insert(source, ['f'])
+        self.assertEqual(self.docstrings_of(result), {'f': 'New f.'})
+        self.assertIn('def f(\n    a,\n    b,\n):\n', result)
+        self.assertIn('    return a\n', result)
+        self.assertNotIn('Old.', result)
+
+    def test_multiline_signature_without_docstring(self):
+        source = textwrap.dedent('''
+            def g(x,
+                  y):
+                return x + y
+        ''')
+        result = self.insert(source, ['g'])
+        self.assertEqual(self.docstrings_of(result), {'g': 'New g.'})
+        self.assertIn('def g(x,\n      y):\n', result)
+
+    def test_methods_keep_their_indentation(self):
+        source = textwrap.dedent('''
+            class A:
+                def m(self):
+                    """Old."""
+                    return 1
+
+                def n(self,
+                      other):
+                    return other
+        ''')
+        result = self.insert(source, ['m', 'n'])
+        self.assertEqual(self.docstrings_of(result), {'m': 'New m.', 'n': 'New n.'})
+
+    def test_body_on_header_line_is_left_alone(self):
+        source = 'def f(): pass\n'
+        self.assertEqual(self.insert(source, ['f']), source)
+
+    def test_failed_results_are_not_inserted(self):
+        source = 'def f():\n    return 1\n'
+        functions = CodeParser().parse_code(source)
+        docstrings = {'f': {'docstring': 'Error generating docstring: 429', 'status': 'error'}}
+        self.assertEqual(insert_docstrings_into_code(source, functions, docstrings), source)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Tests for core.parser."""
+
+import ast
+import textwrap
+import unittest
+
+from core.parser import CodeParser
+
+
+class VisitTest(unittest.TestCase):
+    """Which definitions CodeParser finds."""
+
+    def test_definitions_under_except_and_case(self):
+        source = textwrap.dedent('''
+            try:
+                import json
+            except ImportError:
+                def fallback():
+                    pass
+
+            match value:
+                case 1:
+                    def inmatch():
+                        pass
+        ''')
+        functions = CodeParser().parse_code(source)
+        self.assertEqual([f.name for f in functions], ['fallback', 'inmatch'])
+
+    def test_methods_and_nested_functions_in_source_order(self):
+        source = textwrap.dedent('''
+            class A:
+                def method(self):
+                    def inner():
+                        pass
+
+            def top():
+                pass
+        ''')
+        functions = CodeParser().parse_code(source)
+        self.assertEqual([f.name for f in functions], ['method', 'inner', 'top'])
+
+
+class ParseTreeReportTest(unittest.TestCase):
+    """The dict shape ParserTab reads from parse_tree_report."""
+
+    SOURCE = textwrap.dedent('''
+        class Shape:
+            """A shape."""
+
+            def area(self, scale: float = 1.0) -> float:
+                return 0.0
+
+        def helper(x):
+            """Help."""
+            return x
+    ''')
+
+    def report(self, source):
+        return CodeParser().parse_tree_report(ast.parse(source), source)
+
+    def test_summary_keys(self):
+        report = self.report(self.SOURCE)
+        self.assertTrue(report['success'])
+        self.assertEqual(report['total_items'], 3)
+        self.assertEqual(report['items_with_docstrings'], 2)
+        self.assertEqual(report['accuracy'], 100.0)
+
+    def test_function_items(self):
+        functions = self.report(self.SOURCE)['functions']
+        self.assertEqual([f['name'] for f in functions], ['area', 'helper'])
+
+        area = functions[0]
+        self.assertEqual((area['line'], area['line_end']), (5, 6))
+        self.assertFalse(area['has_docstring'])
+        self.assertEqual(area['params'], [{'name': 'self'}, {'name': 'scale', 'type': 'float'}])
+        self.assertEqual(area['return_type'], 'float')
+        self.assertTrue(functions[1]['has_docstring'])
+
+    def test_class_items(self):
+        classes = self.report(self.SOURCE)['classes']
+        self.assertEqual(len(classes), 1)
+        self.assertEqual(classes[0]['name'], 'Shape')
+        self.assertEqual((classes[0]['line'], classes[0]['line_end']), (2, 6))
+        self.assertTrue(classes[0]['has_docstring'])
+        self.assertNotIn('params', classes[0])
+
+    def test_items_carry_line_ranges_not_source(self):
+        report = self.report(self.SOURCE)
+        lines = self.SOURCE.split('\n')
+        for item in report['functions'] + report['classes']:
+            self.assertNotIn('source', item)
+            header = lines[item['line'] - 1].strip()
+            self.assertTrue(header.startswith(('def ', 'class ')), header)
+            self.assertTrue(lines[item['line_end'] - 1].strip())
+
+
+if __name__ == '__main__':
+    unittest.main()
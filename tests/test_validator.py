@@ -0,0 +1,54 @@
+"""Tests for core.validator."""
+
+import ast
+import textwrap
+import unittest
+
+from core.validator import DocstringValidator
+
+
+class InsertDocstringsTest(unittest.TestCase):
+    """Where DocstringValidator._insert_docstrings puts docstrings."""
+
+    def insert(self, source, names):
+        docstrings = {name: {'docstring': f'Doc for {name}.'} for name in names}
+        return DocstringValidator()._insert_docstrings(source, docstrings)
+
+    def assert_documented(self, result, names):
+        tree = ast.parse(result)
+        found = {
+            node.name: ast.get_docstring(node)
+            for node in ast.walk(tree)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        }
+        for name in names:
+            self.assertEqual(found[name], f'Doc for {name}.')
+
+    def test_default_call_and_tuple_default_signatures(self):
+        source = textwrap.dedent('''
+            def f(x=len("a")):
+                return x
+
+            def g(a, b=(1, 2)):
+                return a, b
+        ''')
+        self.assert_documented(self.insert(source, ['f', 'g']), ['f', 'g'])
+
+    def test_multiline_signature_and_method(self):
+        source = textwrap.dedent('''
+            class A:
+                async def run(
+                    self,
+                    value: int = 0,
+                ) -> int:
+                    return value
+        ''')
+        self.assert_documented(self.insert(source, ['run']), ['run'])
+
+    def test_body_on_header_line_is_left_alone(self):
+        source = 'def f(): pass\n'
+        self.assertEqual(self.insert(source, ['f']), source)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,29 +7,37 @@ from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
     QPushButton, QLabel, QTextEdit, QListWidget, QGroupBox,
     QRadioButton, QFileDialog, QMessageBox, QProgressBar,
-    QSplitter, QPlainTextEdit, QListWidgetItem
+    QSplitter, QPlainTextEdit, QButtonGroup
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from PyQt5.QtGui import QFont
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
-from matplotlib.figure import Figure
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QImage, QPixmap, QTextCursor
+import hashlib
+import mmap
+import os
 import sys
+import time
 
 from core.parser import CodeParser
-from core.generator import DocstringGenerator
 from core.validator import DocstringValidator
-from utils.config import WINDOW_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT
+from utils.config import DOCSTRING_STYLES, WINDOW_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT, LARGE_FILE_SIZE
+from utils.helpers import insert_docstrings_into_code
 from ui.styles import (
     MAIN_STYLE, HEADER_STYLE, SUBHEADER_STYLE, INFO_LABEL_STYLE,
     SUCCESS_STYLE, WARNING_STYLE, ERROR_STYLE, CODE_EDITOR_STYLE
 )
 
+# Minimum seconds between progress signals from the generator thread
+PROGRESS_INTERVAL = 0.05
+
 
 class GeneratorThread(QThread):
     """Thread for generating docstrings asynchronously."""
     
     progress = pyqtSignal(int, int)
-    finished = pyqtSignal(dict)
+    # Function name and its docstring so far, while responses stream in
+    partial = pyqtSignal(str, str)
+    # Results, docstring output blocks and fixes report (empty if no fixes)
+    finished = pyqtSignal(dict, list, str)
     
     def __init__(self, generator, functions, style):
         super().__init__()
@@ -39,12 +47,151 @@ class GeneratorThread(QThread):
     
     def run(self):
         """Run the generation process."""
+        last_emit = 0.0
+        
+        def report_progress(current, total):
+            # Throttle cross-thread signals, but always send the final one
+            nonlocal last_emit
+            now = time.monotonic()
+            if current == total or now - last_emit >= PROGRESS_INTERVAL:
+                last_emit = now
+                self.progress.emit(current, total)
+        
+        last_partial = (None, 0.0)
+        
+        def report_partial(name, docstring):
+            # Throttle repeated updates for the same function only, so each
+            # function's first docstring always gets through
+            nonlocal last_partial
+            now = time.monotonic()
+            if name != last_partial[0] or now - last_partial[1] >= PROGRESS_INTERVAL:
+                last_partial = (name, now)
+                self.partial.emit(name, docstring)
+        
         results = self.generator.generate_batch(
-            self.functions,
-            self.style,
-            lambda current, total: self.progress.emit(current, total)
+            self.functions, self.style, report_progress, stream_callback=report_partial
         )
-        self.finished.emit(results)
+        docstring_blocks, fixes_text = self._format_results(results)
+        self.finished.emit(results, docstring_blocks, fixes_text)
+    
+    def _format_results(self, results):
+        """Build the docstring and fixes reports here rather than on the UI thread."""
+        separator = "=" * 80
+        divider = "-" * 80
+        
+        # One block per function, appended to the output one at a time
+        docstring_blocks = [f"Generated Docstrings:\n\n{separator}\n"]
+        
+        # Display code fixes separately
+        fixes_parts = [f"Suggested Code Fixes:\n\n{separator}\n\n"]
+        has_fixes = False
+        
+        for func_name, result in results.items():
+            # Add to docstrings output
+            docstring_blocks.append(
+                f"Function: {func_name}\n"
+                f"{divider}\n"
+                f"Status: {result.get('status', 'unknown').upper()}\n\n"
+                f"{result['docstring']}\n"
+                f"\n{separator}\n"
+            )
+            
+            # Add to fixes output if there are fixes or errors
+            if result.get('fixed_code') or result.get('errors'):
+                has_fixes = True
+                fixes_parts.append(f"Function: {func_name}\n{divider}\n")
+                
+                if result.get('errors'):
+                    fixes_parts.append("⚠ Issues Found:\n")
+                    fixes_parts.extend(f"  • {error}\n" for error in result['errors'])
+                    fixes_parts.append("\n")
+                
+                if result.get('fixed_code'):
+                    fixes_parts.append(f"Suggested Fixed Code:\n{result['fixed_code']}\n")
+                
+                fixes_parts.append(f"\n{separator}\n\n")
+        
+        return docstring_blocks, ''.join(fixes_parts) if has_fixes else ""
+
+
+class ParserThread(QThread):
+    """Thread for parsing source code and building the AST report."""
+    
+    finished = pyqtSignal(list, str)
+    
+    def __init__(self, parser, source_code):
+        super().__init__()
+        self.parser = parser
+        self.source_code = source_code
+    
+    def run(self):
+        """Run the parsing process."""
+        functions = self.parser.parse_code(self.source_code)
+        
+        ast_parts = ["AST Parsing Results:\n\n"]
+        for func in functions:
+            ast_parts.append(
+                f"Function: {func.name}\n"
+                f"  Line: {func.lineno}\n"
+                f"  Arguments: {', '.join([arg['name'] for arg in func.args])}\n"
+                f"  Returns: {func.returns or 'None'}\n"
+                f"  Has Docstring: {'Yes' if func.existing_docstring else 'No'}\n\n"
+            )
+        
+        self.finished.emit(functions, ''.join(ast_parts))
+
+
+def _read_source_file(file_path):
+    """
+    Read a UTF-8 Python source file.
+    
+    Large files are decoded straight from a memory map instead of being
+    read into an intermediate bytes object first.
+    
+    Args:
+        file_path (str): Path to the file
+        
+    Returns:
+        str: The source code with universal newlines
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > LARGE_FILE_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                source_code = str(mm, 'utf-8')
+        else:
+            source_code = f.read().decode('utf-8')
+    
+    # Match what text mode would have returned
+    if '\r' in source_code:
+        source_code = source_code.replace('\r\n', '\n').replace('\r', '\n')
+    return source_code
+
+
+class InserterThread(QThread):
+    """Thread for inserting docstrings and saving the output file."""
+    
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, source_code, functions, docstrings, file_path):
+        super().__init__()
+        self.source_code = source_code
+        self.functions = functions
+        self.docstrings = docstrings
+        self.file_path = file_path
+    
+    def run(self):
+        """Build the output code and write it to disk."""
+        try:
+            output_code = insert_docstrings_into_code(self.source_code, self.functions, self.docstrings)
+            
+            with open(self.file_path, 'w', encoding='utf-8') as f:
+                f.write(output_code)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        
+        self.finished.emit(self.file_path)
 
 
 class MainWindow(QMainWindow):
@@ -63,8 +210,17 @@ class MainWindow(QMainWindow):
         # Data storage
         self.source_code = ""
         self.parsed_functions = []
+        self.parsed_tree = None
+        # Source the parse results belong to; source_code may have changed since
+        self.parsed_source = ""
+        self.parser_thread = None
         self.generated_docstrings = {}
         self.validation_results = {}
+        self._last_chart = None
+        self._last_validation_key = None
+        # Function whose streamed docstring is shown last, and where it starts
+        self._partial_name = None
+        self._partial_start = 0
         
         # Setup UI
         self.init_ui()
@@ -126,9 +282,9 @@ class MainWindow(QMainWindow):
         paste_btn.clicked.connect(self.paste_code)
         file_layout.addWidget(paste_btn)
         
-        parse_btn = QPushButton("Parse Code")
-        parse_btn.clicked.connect(self.parse_code)
-        file_layout.addWidget(parse_btn)
+        self.parse_btn = QPushButton("Parse Code")
+        self.parse_btn.clicked.connect(self.parse_code)
+        file_layout.addWidget(self.parse_btn)
         
         file_group.setLayout(file_layout)
         left_layout.addWidget(file_group)
@@ -190,6 +346,8 @@ class MainWindow(QMainWindow):
         
         self.code_preview = QPlainTextEdit()
         self.code_preview.setReadOnly(True)
+        self.code_preview.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.code_preview.setUndoRedoEnabled(False)
         self.code_preview.setStyleSheet(CODE_EDITOR_STYLE)
         preview_layout.addWidget(self.code_preview)
         
@@ -204,8 +362,9 @@ class MainWindow(QMainWindow):
         ast_label.setStyleSheet(SUBHEADER_STYLE)
         ast_layout.addWidget(ast_label)
         
-        self.ast_output = QTextEdit()
+        self.ast_output = QPlainTextEdit()
         self.ast_output.setReadOnly(True)
+        self.ast_output.setUndoRedoEnabled(False)
         ast_layout.addWidget(self.ast_output)
         
         main_splitter.addWidget(ast_widget)
@@ -248,6 +407,13 @@ class MainWindow(QMainWindow):
         self.style_rest = QRadioButton("reST Style")
         self.style_google.setChecked(True)
         
+        # Button ids index into the style names
+        self.style_names = DOCSTRING_STYLES
+        self.style_group = QButtonGroup(self)
+        self.style_group.addButton(self.style_google, self.style_names.index("Google"))
+        self.style_group.addButton(self.style_numpy, self.style_names.index("NumPy"))
+        self.style_group.addButton(self.style_rest, self.style_names.index("reST"))
+        
         style_layout.addWidget(self.style_google)
         style_layout.addWidget(self.style_numpy)
         style_layout.addWidget(self.style_rest)
@@ -316,8 +482,10 @@ class MainWindow(QMainWindow):
         docstring_label.setStyleSheet(SUBHEADER_STYLE)
         docstring_layout.addWidget(docstring_label)
         
-        self.docstring_output = QTextEdit()
+        self.docstring_output = QPlainTextEdit()
         self.docstring_output.setReadOnly(True)
+        self.docstring_output.setUndoRedoEnabled(False)
+        self.docstring_output.setLineWrapMode(QPlainTextEdit.NoWrap)
         docstring_layout.addWidget(self.docstring_output)
         
         main_splitter.addWidget(docstring_widget)
@@ -331,8 +499,10 @@ class MainWindow(QMainWindow):
         fixes_label.setStyleSheet(SUBHEADER_STYLE)
         fixes_layout.addWidget(fixes_label)
         
-        self.fixes_output = QTextEdit()
+        self.fixes_output = QPlainTextEdit()
         self.fixes_output.setReadOnly(True)
+        self.fixes_output.setUndoRedoEnabled(False)
+        self.fixes_output.setLineWrapMode(QPlainTextEdit.NoWrap)
         self.fixes_output.setPlaceholderText("Code fix suggestions will appear here after generation...")
         fixes_layout.addWidget(self.fixes_output)
         
@@ -347,13 +517,18 @@ class MainWindow(QMainWindow):
         validation_label.setStyleSheet(SUBHEADER_STYLE)
         validation_layout.addWidget(validation_label)
         
-        # Chart
+        # Chart, shown as a pixmap rendered by matplotlib on first use, so
+        # resizes and repaints never re-run matplotlib
         self.chart_widget = QWidget()
         chart_layout = QVBoxLayout(self.chart_widget)
         chart_layout.setContentsMargins(0, 0, 0, 0)
-        self.figure = Figure(figsize=(5, 3))
-        self.canvas = FigureCanvasQTAgg(self.figure)
-        chart_layout.addWidget(self.canvas)
+        self.chart_label = QLabel()
+        self.chart_label.setAlignment(Qt.AlignCenter)
+        chart_layout.addWidget(self.chart_label)
+        self.figure = None
+        self.canvas = None
+        self.chart_axes = None
+        self.chart_bars = None
         validation_layout.addWidget(self.chart_widget)
         
         # Detailed validation report
@@ -361,8 +536,10 @@ class MainWindow(QMainWindow):
         validation_report_label.setStyleSheet(INFO_LABEL_STYLE)
         validation_layout.addWidget(validation_report_label)
         
-        self.validation_output = QTextEdit()
+        self.validation_output = QPlainTextEdit()
         self.validation_output.setReadOnly(True)
+        self.validation_output.setMaximumBlockCount(5000)
+        self.validation_output.setUndoRedoEnabled(False)
         self.validation_output.setPlaceholderText("Validation details will appear here after validation...")
         validation_layout.addWidget(self.validation_output)
         
@@ -389,6 +566,8 @@ class MainWindow(QMainWindow):
     
     def set_api_key(self):
         """Set the Gemini API key."""
+        from core.generator import DocstringGenerator
+        
         api_key = self.api_key_input.toPlainText().strip()
         if api_key:
             self.generator = DocstringGenerator(api_key)
@@ -404,9 +583,7 @@ class MainWindow(QMainWindow):
         
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    self.source_code = f.read()
-                self.code_preview.setPlainText(self.source_code)
+                self.set_source_code(_read_source_file(file_path))
                 QMessageBox.information(self, "Success", "File loaded successfully!")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to load file: {str(e)}")
@@ -436,28 +613,63 @@ class MainWindow(QMainWindow):
         layout.addLayout(btn_layout)
         
         if dialog.exec_() == QDialog.Accepted:
-            self.source_code = text_edit.toPlainText()
-            self.code_preview.setPlainText(self.source_code)
+            self.set_source_code(text_edit.toPlainText())
             QMessageBox.information(self, "Success", "Code pasted successfully!")
     
+    def set_source_code(self, source_code):
+        """
+        Load new source code and drop everything derived from the old one.
+        
+        Args:
+            source_code (str): The new Python source code
+        """
+        self.source_code = source_code
+        self.parsed_functions = []
+        self.parsed_tree = None
+        self.parsed_source = ""
+        self.generated_docstrings = {}
+        self.functions_list.clear()
+        self.code_preview.setPlainText(source_code)
+    
     def parse_code(self):
         """Parse the source code."""
         if not self.source_code:
             QMessageBox.warning(self, "Warning", "Please load or paste source code first.")
             return
         
-        self.parsed_functions = self.parser.parse_code(self.source_code)
+        # Only one parse at a time; both threads would share self.parser
+        if self.parser_thread is not None and self.parser_thread.isRunning():
+            return
+        
+        # Parse and build the AST report in a thread
+        self.parse_btn.setEnabled(False)
+        self.parser_thread = ParserThread(self.parser, self.source_code)
+        self.parser_thread.finished.connect(self.parsing_finished)
+        self.parser_thread.start()
+    
+    def parsing_finished(self, functions, ast_text):
+        """Handle parsing completion."""
+        self.parse_btn.setEnabled(True)
+        self.parsed_functions = functions
+        self.parsed_tree = self.parser.tree
+        self.parsed_source = self.parser_thread.source_code
+        self.generated_docstrings = {}
         
         # Update accuracy
         self.accuracy_label.setText(f"Accuracy: {self.parser.accuracy:.1f}%")
         self.accuracy_bar.setValue(int(self.parser.accuracy))
         
-        # Update functions list
+        # Update functions list; row i shows parsed_functions[i]
+        labels = [
+            f"{'✓' if func.existing_docstring else '✗'} {func.name}()"
+            for func in self.parsed_functions
+        ]
+        
+        # Fill in one call with repaints paused
+        self.functions_list.setUpdatesEnabled(False)
         self.functions_list.clear()
-        for func in self.parsed_functions:
-            status = "✓" if func.existing_docstring else "✗"
-            item = QListWidgetItem(f"{status} {func.name}()")
-            self.functions_list.addItem(item)
+        self.functions_list.addItems(labels)
+        self.functions_list.setUpdatesEnabled(True)
         
         # Update coverage
         coverage = self.parser.get_coverage_stats()
@@ -468,15 +680,7 @@ class MainWindow(QMainWindow):
         )
         
         # Update AST output
-        ast_text = "AST Parsing Results:\n\n"
-        for func in self.parsed_functions:
-            ast_text += f"Function: {func.name}\n"
-            ast_text += f"  Line: {func.lineno}\n"
-            ast_text += f"  Arguments: {', '.join([arg['name'] for arg in func.args])}\n"
-            ast_text += f"  Returns: {func.returns or 'None'}\n"
-            ast_text += f"  Has Docstring: {'Yes' if func.existing_docstring else 'No'}\n\n"
-        
-        self.ast_output.setText(ast_text)
+        self.ast_output.setPlainText(ast_text)
         
         if self.parser.errors:
             QMessageBox.warning(
@@ -488,25 +692,26 @@ class MainWindow(QMainWindow):
     
     def show_function_details(self, item):
         """Show details of selected function."""
-        func_name = item.text().split()[-1].replace("()", "")
-        
-        for func in self.parsed_functions:
-            if func.name == func_name:
-                details = f"Function: {func.name}\n\n"
-                details += f"Arguments:\n"
-                for arg in func.args:
-                    details += f"  - {arg['name']}: {arg['type'] or 'Any'}\n"
-                details += f"\nReturns: {func.returns or 'None'}\n\n"
-                
-                if func.existing_docstring:
-                    details += f"Existing Docstring:\n{func.existing_docstring}\n\n"
-                else:
-                    details += "No existing docstring.\n\n"
-                
-                details += f"Function Body:\n{func.body}"
-                
-                self.ast_output.setText(details)
-                break
+        # Rows follow parsed_functions, so same-named methods stay distinct
+        row = self.functions_list.row(item)
+        if not 0 <= row < len(self.parsed_functions):
+            return
+        func = self.parsed_functions[row]
+        
+        details = f"Function: {func.name}\n\n"
+        details += f"Arguments:\n"
+        for arg in func.args:
+            details += f"  - {arg['name']}: {arg['type'] or 'Any'}\n"
+        details += f"\nReturns: {func.returns or 'None'}\n\n"
+        
+        if func.existing_docstring:
+            details += f"Existing Docstring:\n{func.existing_docstring}\n\n"
+        else:
+            details += "No existing docstring.\n\n"
+        
+        details += f"Function Body:\n{func.body}"
+        
+        self.ast_output.setPlainText(details)
     
     def generate_docstrings(self):
         """Generate docstrings for all functions."""
@@ -525,71 +730,68 @@ class MainWindow(QMainWindow):
             return
         
         # Get selected style
-        if self.style_google.isChecked():
-            style = "Google"
-        elif self.style_numpy.isChecked():
-            style = "NumPy"
-        else:
-            style = "reST"
+        style = self.style_names[self.style_group.checkedId()]
         
         # Start generation in thread
         self.progress_bar.setValue(0)
+        self.docstring_output.clear()
+        self._partial_name = None
         self.thread = GeneratorThread(self.generator, self.parsed_functions, style)
         self.thread.progress.connect(self.update_progress)
+        self.thread.partial.connect(self.show_partial_docstring)
         self.thread.finished.connect(self.generation_finished)
         self.thread.start()
     
     def update_progress(self, current, total):
         """Update progress bar."""
         progress = int((current / total) * 100)
-        self.progress_bar.setValue(progress)
+        if progress != self.progress_bar.value():
+            self.progress_bar.setValue(progress)
     
-    def generation_finished(self, results):
+    def show_partial_docstring(self, name, docstring):
+        """
+        Show a docstring while it is still being generated.
+        
+        Updates for the function shown last replace its block; any other
+        function gets a new block. The final output replaces all of them.
+        
+        Args:
+            name (str): Function name
+            docstring (str): Docstring received so far
+        """
+        if not docstring:
+            return
+        
+        cursor = self.docstring_output.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        if name == self._partial_name:
+            # Select this function's block so the new text replaces it
+            cursor.setPosition(self._partial_start, QTextCursor.KeepAnchor)
+        else:
+            self._partial_name = name
+            if not self.docstring_output.document().isEmpty():
+                cursor.insertBlock()
+            self._partial_start = cursor.position()
+        cursor.insertText(f"{name}: {docstring}")
+    
+    def generation_finished(self, results, docstring_blocks, fixes_text):
         """Handle generation completion."""
+        # Results for functions from an earlier parse no longer apply
+        if self.sender().functions is not self.parsed_functions:
+            return
         self.generated_docstrings = results
         
-        # Display docstrings
-        docstring_text = "Generated Docstrings:\n\n"
-        docstring_text += "=" * 80 + "\n\n"
+        # Display docstrings one block per function, so Qt only lays out
+        # what is on screen instead of reflowing one huge string
+        self.docstring_output.clear()
+        for block in docstring_blocks:
+            self.docstring_output.appendPlainText(block)
         
         # Display code fixes separately
-        fixes_text = "Suggested Code Fixes:\n\n"
-        fixes_text += "=" * 80 + "\n\n"
-        has_fixes = False
-        
-        for func_name, result in results.items():
-            # Add to docstrings output
-            docstring_text += f"Function: {func_name}\n"
-            docstring_text += "-" * 80 + "\n"
-            docstring_text += f"Status: {result.get('status', 'unknown').upper()}\n\n"
-            docstring_text += result['docstring'] + "\n"
-            docstring_text += "\n" + "=" * 80 + "\n\n"
-            
-            # Add to fixes output if there are fixes or errors
-            if result.get('fixed_code') or result.get('errors'):
-                has_fixes = True
-                fixes_text += f"Function: {func_name}\n"
-                fixes_text += "-" * 80 + "\n"
-                
-                if result.get('errors'):
-                    fixes_text += f"⚠ Issues Found:\n"
-                    for error in result['errors']:
-                        fixes_text += f"  • {error}\n"
-                    fixes_text += "\n"
-                
-                if result.get('fixed_code'):
-                    fixes_text += f"Suggested Fixed Code:\n"
-                    fixes_text += f"{result['fixed_code']}\n"
-                
-                fixes_text += "\n" + "=" * 80 + "\n\n"
-        
-        # Update outputs
-        self.docstring_output.setText(docstring_text)
-        
-        if has_fixes:
-            self.fixes_output.setText(fixes_text)
+        if fixes_text:
+            self.fixes_output.setPlainText(fixes_text)
         else:
-            self.fixes_output.setText("No code issues detected! All functions are syntactically correct.")
+            self.fixes_output.setPlainText("No code issues detected! All functions are syntactically correct.")
         
         QMessageBox.information(self, "Success", "Docstrings generated successfully!")
 
@@ -609,11 +811,19 @@ class MainWindow(QMainWindow):
             for func_name, result in self.generated_docstrings.items():
                 docstrings_dict[func_name] = result
             
-            # Validate
-            self.validation_results = self.validator.validate_code(
-                self.source_code,
-                docstrings_dict
-            )
+            # Validate, unless the same code and docstrings were just validated
+            validation_key = hashlib.blake2b(repr((
+                self.parsed_source,
+                sorted((name, result.get('docstring', '')) for name, result in docstrings_dict.items())
+            )).encode()).digest()
+            
+            if validation_key != self._last_validation_key:
+                self.validation_results = self.validator.validate_from_tree(
+                    self.parsed_tree,
+                    self.parsed_source,
+                    docstrings_dict
+                )
+                self._last_validation_key = validation_key
             
             # Update status summary
             summary = self.validation_results['summary']
@@ -621,39 +831,37 @@ class MainWindow(QMainWindow):
             self.status_warnings.setText(f"⚠ Warnings: {summary['warnings']}")
             self.status_errors.setText(f"✗ Errors: {summary['errors']}")
             
-            # Update chart
-            self.update_validation_chart(summary)
+            # Update chart once the report below has been laid out
+            QTimer.singleShot(0, lambda: self.update_validation_chart(summary))
             
             # Update detailed validation report
             status_items = self.validator.get_file_status(self.validation_results)
-            validation_text = "PEP 257 Validation Details:\n\n"
+            # Appended one group at a time so the report renders progressively
+            self.validation_output.clear()
+            self.validation_output.appendPlainText("PEP 257 Validation Details:\n")
             
             if not status_items:
-                validation_text += "🎉 Excellent! All docstrings follow PEP 257 standards!\n\n"
-                validation_text += "Your generated docstrings are fully compliant with Python's\n"
-                validation_text += "documentation standards. No issues detected.\n"
+                self.validation_output.appendPlainText(
+                    "🎉 Excellent! All docstrings follow PEP 257 standards!\n\n"
+                    "Your generated docstrings are fully compliant with Python's\n"
+                    "documentation standards. No issues detected."
+                )
             else:
-                validation_text += f"Total Issues Found: {len(status_items)}\n\n"
+                self.validation_output.appendPlainText(f"Total Issues Found: {len(status_items)}\n")
                 
                 # Group by severity
                 errors_list = [item for item in status_items if item['severity'] == 'error']
                 warnings_list = [item for item in status_items if item['severity'] == 'warning']
                 
-                if errors_list:
-                    validation_text += "❌ ERRORS (Must Fix):\n"
-                    validation_text += "-" * 60 + "\n"
-                    for item in errors_list:
-                        validation_text += f"  • {item['code']}: {item['message']}\n"
-                        validation_text += f"    Occurrences: {item['count']}\n\n"
-                
-                if warnings_list:
-                    validation_text += "\n⚠ WARNINGS (Should Fix):\n"
-                    validation_text += "-" * 60 + "\n"
-                    for item in warnings_list:
-                        validation_text += f"  • {item['code']}: {item['message']}\n"
-                        validation_text += f"    Occurrences: {item['count']}\n\n"
-            
-            self.validation_output.setText(validation_text)
+                for title, items in (("❌ ERRORS (Must Fix):", errors_list),
+                                     ("\n⚠ WARNINGS (Should Fix):", warnings_list)):
+                    if items:
+                        self.validation_output.appendPlainText(title + "\n" + "-" * 60)
+                        for item in items:
+                            self.validation_output.appendPlainText(
+                                f"  • {item['code']}: {item['message']}\n"
+                                f"    Occurrences: {item['count']}\n"
+                            )
             
             QMessageBox.information(self, "Validation Complete", 
                                   f"PEP 257 validation completed!\n\n"
@@ -670,19 +878,53 @@ class MainWindow(QMainWindow):
     
     def update_validation_chart(self, summary):
         """Update the validation results chart."""
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        
-        categories = ['Compliant', 'Warnings', 'Errors']
         values = [summary['compliant'], summary['warnings'], summary['errors']]
-        colors = ['#4CAF50', '#FF9800', '#F44336']
         
-        ax.bar(categories, values, color=colors)
-        ax.set_ylabel('Count')
-        ax.set_title('PEP 257 Validation Results')
-        ax.grid(axis='y', alpha=0.3)
+        # Nothing to redraw if the counts are the same as last time
+        if values == self._last_chart:
+            return
+        self._last_chart = values
         
-        self.canvas.draw()
+        # Runs from a QTimer callback, outside validate_docstrings' error
+        # handling, so failures are reported here
+        try:
+            if self.figure is None:
+                # matplotlib is only loaded once there is something to plot
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+                from matplotlib.figure import Figure
+            
+                self.figure = Figure(figsize=(5, 3))
+                self.canvas = FigureCanvasAgg(self.figure)
+            
+                # Axes and bars are built once, later updates only resize the bars
+                self.chart_axes = self.figure.add_subplot(111)
+                self.chart_bars = self.chart_axes.bar(
+                    ['Compliant', 'Warnings', 'Errors'], [0, 0, 0],
+                    color=['#4CAF50', '#FF9800', '#F44336']
+                )
+                self.chart_axes.set_ylabel('Count')
+                self.chart_axes.set_title('PEP 257 Validation Results')
+                self.chart_axes.grid(axis='y', alpha=0.3)
+            
+            for bar, value in zip(self.chart_bars, values):
+                bar.set_height(value)
+            self.chart_axes.relim()
+            self.chart_axes.autoscale_view()
+            
+            # Render offscreen and keep the result as a pixmap
+            self.canvas.draw()
+            width, height = self.canvas.get_width_height()
+            image = QImage(self.canvas.buffer_rgba(), width, height, QImage.Format_RGBA8888)
+            self.chart_label.setPixmap(QPixmap.fromImage(image))
+        except Exception as e:
+            # Rebuild and draw again on the next update rather than skipping
+            # it as unchanged
+            self._last_chart = None
+            self.figure = None
+            QMessageBox.critical(
+                self, "Chart Error",
+                f"Failed to draw the validation chart:\n\n{str(e)}"
+            )
     
     def download_output(self):
         """Download the generated docstrings and code."""
@@ -698,60 +940,18 @@ class MainWindow(QMainWindow):
         )
         
         if file_path:
-            try:
-                # Insert docstrings into source code
-                output_code = self._insert_docstrings_into_code()
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(output_code)
-                
-                QMessageBox.information(self, "Success", "Output saved successfully!")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save file: {str(e)}")
+            # Insert docstrings and write the file off the UI thread
+            self.inserter_thread = InserterThread(
+                self.parsed_source, self.parsed_functions, self.generated_docstrings, file_path
+            )
+            self.inserter_thread.finished.connect(self.download_finished)
+            self.inserter_thread.failed.connect(self.download_failed)
+            self.inserter_thread.start()
     
-    def _insert_docstrings_into_code(self):
-        """Insert generated docstrings into the source code."""
-        lines = self.source_code.split('\n')
-        result_lines = []
-        i = 0
-        
-        while i < len(lines):
-            line = lines[i]
-            result_lines.append(line)
-            
-            # Check if this is a function definition
-            if line.strip().startswith('def '):
-                func_name = line.split('def ')[1].split('(')[0].strip()
-                
-                # If we have a generated docstring for this function
-                if func_name in self.generated_docstrings:
-                    result = self.generated_docstrings[func_name]
-                    docstring = result.get('docstring', '')
-                    
-                    if docstring and result.get('status') == 'generated':
-                        # Add indentation
-                        indent = len(line) - len(line.lstrip()) + 4
-                        indent_str = ' ' * indent
-                        
-                        # Skip existing docstring if any
-                        j = i + 1
-                        while j < len(lines) and not lines[j].strip():
-                            j += 1
-                        if j < len(lines) and (lines[j].strip().startswith('"""') or lines[j].strip().startswith("'''")):
-                            # Skip old docstring
-                            while j < len(lines):
-                                if '"""' in lines[j] or "'''" in lines[j]:
-                                    if j > i + 1:
-                                        i = j
-                                        break
-                                j += 1
-                        
-                        # Add new docstring
-                        result_lines.append(indent_str + '"""')
-                        for doc_line in docstring.split('\n'):
-                            result_lines.append(indent_str + doc_line)
-                        result_lines.append(indent_str + '"""')
-            
-            i += 1
-        
-        return '\n'.join(result_lines)
\ No newline at end of file
+    def download_finished(self, file_path):
+        """Handle a completed save."""
+        QMessageBox.information(self, "Success", "Output saved successfully!")
+    
+    def download_failed(self, error):
+        """Handle a failed save."""
+        QMessageBox.critical(self, "Error", f"Failed to save file: {error}")
@@ -1,13 +1,25 @@
 """Parser tab UI component."""
 
+import ast
+import hashlib
+import re
+from collections import OrderedDict
+from pathlib import Path
+
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTextEdit, QLabel, QListWidget, QSplitter, QFileDialog,
+    QPlainTextEdit, QLabel, QListWidget, QSplitter, QFileDialog,
     QGroupBox, QMessageBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from core import CodeParser
 
+# Larger uploads are only partially shown in the source preview
+MAX_PREVIEW_CHARS = 300_000
+
+# Number of recently parsed sources kept with their results and AST
+PARSE_CACHE_SIZE = 4
+
 
 class ParserTab(QWidget):
     """Tab for parsing source code and displaying AST output."""
@@ -18,6 +30,17 @@ class ParserTab(QWidget):
         self.parser = CodeParser()
         self.current_code = ""
         self.parsed_data = None
+        self._ast = None
+        # Set while the preview shows only the start of current_code
+        self._preview_truncated = False
+        # Code the parse results came from, kept as it was when parsed, and
+        # the offset where each of its lines starts, for slicing item source
+        self._parsed_code = ""
+        self._line_starts = []
+        # (parse results, AST) keyed by SHA-256 of the source, least recent first
+        self._parse_cache = OrderedDict()
+        # Parsed items in list row order (functions, then classes)
+        self._list_items = []
         self.init_ui()
 
     def init_ui(self):
@@ -63,6 +86,12 @@ class ParserTab(QWidget):
         layout.addWidget(splitter)
         self.setLayout(layout)
 
+        # Re-check the preview for content once typing or pasting settles
+        self._paste_timer = QTimer(self)
+        self._paste_timer.setSingleShot(True)
+        self._paste_timer.timeout.connect(self._refresh_parse_enabled)
+        self.source_preview.textChanged.connect(lambda: self._paste_timer.start(150))
+
     def create_left_panel(self):
         """Create the left panel with project info."""
         panel = QWidget()
@@ -106,7 +135,7 @@ class ParserTab(QWidget):
         source_label.setObjectName("subHeaderLabel")
         layout.addWidget(source_label)
 
-        self.source_preview = QTextEdit()
+        self.source_preview = QPlainTextEdit()
         self.source_preview.setReadOnly(True)
         self.source_preview.setPlaceholderText("Upload or paste Python code here...")
         layout.addWidget(self.source_preview)
@@ -116,7 +145,7 @@ class ParserTab(QWidget):
         ast_label.setObjectName("subHeaderLabel")
         layout.addWidget(ast_label)
 
-        self.ast_output = QTextEdit()
+        self.ast_output = QPlainTextEdit()
         self.ast_output.setReadOnly(True)
         self.ast_output.setPlaceholderText("Select a function or class from the list to view details...")
         layout.addWidget(self.ast_output)
@@ -135,38 +164,68 @@ class ParserTab(QWidget):
 
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    self.current_code = f.read()
-                    self.source_preview.setPlainText(self.current_code)
-                    self.parse_btn.setEnabled(True)
+                self.current_code = Path(file_path).read_text(encoding='utf-8')
+                self._preview_truncated = len(self.current_code) > MAX_PREVIEW_CHARS
+
+                preview = self.current_code
+                if self._preview_truncated:
+                    preview = (
+                        self.current_code[:MAX_PREVIEW_CHARS]
+                        + "\n\n... [truncated for preview; full file will still be parsed]"
+                    )
+
+                # Lay the document out once, with repaints paused
+                self.source_preview.setUpdatesEnabled(False)
+                self.source_preview.setPlainText(preview)
+                self.source_preview.setUpdatesEnabled(True)
+                self.parse_btn.setEnabled(True)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to read file: {str(e)}")
 
     def paste_code(self):
         """Enable pasting code directly."""
         self.source_preview.setReadOnly(False)
+
+        # A truncated preview is not the uploaded code, so start from empty
+        if self._preview_truncated:
+            self._preview_truncated = False
+            self.current_code = ""
+            self.source_preview.clear()
         self.source_preview.setPlaceholderText("Paste your Python code here and click Parse Code...")
         self.source_preview.setFocus()
-        self.parse_btn.setEnabled(True)
 
-        # Show message
-        QMessageBox.information(
-            self,
-            "Paste Mode",
-            "You can now paste your code in the preview area.\nClick 'Parse Code' when ready."
-        )
+    def _refresh_parse_enabled(self):
+        """Enable parsing only while the preview has content."""
+        self.parse_btn.setEnabled(not self.source_preview.document().isEmpty())
 
     def parse_code(self):
         """Parse the current code."""
-        # Get code from preview
-        self.current_code = self.source_preview.toPlainText()
+        # Get code from preview, unless it only shows part of an upload
+        if not self._preview_truncated:
+            self.current_code = self.source_preview.toPlainText()
 
         if not self.current_code.strip():
             QMessageBox.warning(self, "Warning", "Please upload or paste some code first.")
             return
 
-        # Parse the code
-        self.parsed_data = self.parser.parse(self.current_code)
+        # Parse the code, unless this exact source was parsed before
+        key = hashlib.sha256(self.current_code.encode('utf-8')).hexdigest()
+        if key in self._parse_cache:
+            self._parse_cache.move_to_end(key)
+            self.parsed_data, self._ast = self._parse_cache[key]
+        else:
+            # Parse once here and hand the tree to the parser
+            try:
+                self._ast = ast.parse(self.current_code)
+            except SyntaxError as e:
+                self._ast = None
+                self.parsed_data = {'success': False, 'error': str(e)}
+            else:
+                self.parsed_data = self.parser.parse_tree_report(self._ast, self.current_code)
+                if self.parsed_data['success']:
+                    self._parse_cache[key] = (self.parsed_data, self._ast)
+                    if len(self._parse_cache) > PARSE_CACHE_SIZE:
+                        self._parse_cache.popitem(last=False)
 
         if not self.parsed_data['success']:
             QMessageBox.critical(
@@ -176,6 +235,14 @@ class ParserTab(QWidget):
             )
             return
 
+        # current_code can be replaced by a later upload; item ranges refer to this text
+        self._parsed_code = self.current_code
+        self._line_starts = [0]
+        self._line_starts.extend(match.end() for match in re.finditer('\n', self._parsed_code))
+
+        # Row i of the list shows _list_items[i], so clicks are index lookups
+        self._list_items = self.parsed_data['functions'] + self.parsed_data['classes']
+
         # Update UI
         self.update_statistics()
         self.update_functions_list()
@@ -206,65 +273,76 @@ class ParserTab(QWidget):
         if not self.parsed_data:
             return
 
-        # Add functions
-        for func in self.parsed_data['functions']:
-            status = "✓" if func['has_docstring'] else "✗"
-            self.functions_list.addItem(f"{status} Function: {func['name']} (line {func['line']})")
+        # Functions, then classes
+        rows = [
+            f"{'✓' if func['has_docstring'] else '✗'} Function: {func['name']} (line {func['line']})"
+            for func in self.parsed_data['functions']
+        ]
+        rows.extend(
+            f"{'✓' if cls['has_docstring'] else '✗'} Class: {cls['name']} (line {cls['line']})"
+            for cls in self.parsed_data['classes']
+        )
 
-        # Add classes
-        for cls in self.parsed_data['classes']:
-            status = "✓" if cls['has_docstring'] else "✗"
-            self.functions_list.addItem(f"{status} Class: {cls['name']} (line {cls['line']})")
+        # Add them in one call with repaints paused
+        self.functions_list.setUpdatesEnabled(False)
+        self.functions_list.addItems(rows)
+        self.functions_list.setUpdatesEnabled(True)
 
     def show_function_details(self, item):
         """Show details of selected function/class."""
         if not self.parsed_data:
             return
 
-        # Get item text
-        text = item.text()
-
-        # Extract name
-        parts = text.split(": ")
-        if len(parts) < 2:
+        # Find the item by row, so repeated names (e.g. __init__) stay distinct
+        row = self.functions_list.row(item)
+        if not 0 <= row < len(self._list_items):
             return
 
-        name = parts[1].split(" (line")[0]
-
-        # Find the item
-        all_items = self.parsed_data['functions'] + self.parsed_data['classes']
-        selected_item = None
+        selected_item = self._list_items[row]
 
-        for item_data in all_items:
-            if item_data['name'] == name:
-                selected_item = item_data
-                break
+        # Details are built once per item and kept on it
+        details = selected_item.get('_details_cache')
+        if details is None:
+            detail_parts = [
+                f"Name: {selected_item['name']}",
+                f"Line: {selected_item['line']}",
+                f"Has Docstring: {'Yes' if selected_item['has_docstring'] else 'No'}",
+                ""
+            ]
 
-        if not selected_item:
-            return
-
-        # Display details
-        details = f"Name: {selected_item['name']}\n"
-        details += f"Line: {selected_item['line']}\n"
-        details += f"Has Docstring: {'Yes' if selected_item['has_docstring'] else 'No'}\n\n"
+            if 'params' in selected_item:
+                detail_parts.append("Parameters:")
+                for param in selected_item['params']:
+                    if 'type' in param:
+                        detail_parts.append(f"  - {param['name']}: {param['type']}")
+                    else:
+                        detail_parts.append(f"  - {param['name']}")
 
-        if 'params' in selected_item:
-            details += "Parameters:\n"
-            for param in selected_item['params']:
-                param_str = f"  - {param['name']}"
-                if 'type' in param:
-                    param_str += f": {param['type']}"
-                details += param_str + "\n"
+                if selected_item.get('return_type'):
+                    detail_parts.append(f"\nReturn Type: {selected_item['return_type']}")
 
-            if selected_item.get('return_type'):
-                details += f"\nReturn Type: {selected_item['return_type']}\n"
+            detail_parts.append("\nSource Code:")
+            detail_parts.append("=" * 50)
+            detail_parts.append(self.get_item_source(selected_item))
 
-        details += "\nSource Code:\n"
-        details += "=" * 50 + "\n"
-        details += selected_item.get('source', '')
+            details = "\n".join(detail_parts)
+            selected_item['_details_cache'] = details
 
         self.ast_output.setPlainText(details)
 
+    def get_item_source(self, item):
+        """Get the source of a parsed item by slicing its line range from the code."""
+        start = self._line_starts[item['line'] - 1]
+        if item['line_end'] < len(self._line_starts):
+            end = self._line_starts[item['line_end']] - 1
+        else:
+            end = len(self._parsed_code)
+        return self._parsed_code[start:end]
+
     def get_parsed_data(self):
         """Get the parsed data for use in other tabs."""
         return self.parsed_data
+
+    def get_ast(self):
+        """Get the AST of the parsed code for use in other tabs."""
+        return self._ast
@@ -3,7 +3,19 @@ UI Styling for Docstring Generator.
 Contains all CSS styles for the PyQt5 interface.
 """
 
-MAIN_STYLE = """
+import re
+
+# Comments and whitespace runs, stripped so Qt's stylesheet parser scans less text
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _minify(style):
+    """Drop comments and collapse whitespace in a Qt stylesheet."""
+    return _WHITESPACE_RE.sub(' ', _COMMENT_RE.sub('', style)).strip()
+
+
+_RAW_MAIN_STYLE = """
 QMainWindow {
     background-color: #f5f5f5;
 }
@@ -163,6 +175,8 @@ QScrollBar::handle:vertical:hover {
 }
 """
 
+MAIN_STYLE = _minify(_RAW_MAIN_STYLE)
+
 HEADER_STYLE = """
 QLabel {
     color: #1976D2;
@@ -1,8 +1,11 @@
 """Validator tab UI component."""
 
+import hashlib
+from pathlib import Path
+
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTextEdit, QLabel, QRadioButton, QButtonGroup,
+    QLineEdit, QPlainTextEdit, QLabel, QRadioButton, QButtonGroup,
     QSplitter, QGroupBox, QMessageBox, QFileDialog,
     QProgressBar, QListWidget
 )
@@ -16,14 +19,16 @@ class GeneratorThread(QThread):
     """Thread for generating docstrings."""
 
     progress = pyqtSignal(int, int)
+    # (cache key, result) pairs
     finished = pyqtSignal(list)
     error = pyqtSignal(str)
 
-    def __init__(self, generator, items, style):
+    def __init__(self, generator, items, keys, style):
         """Initialize the GeneratorThread."""
         super().__init__()
         self.generator = generator
         self.items = items
+        self.keys = keys
         self.style = style
 
     def run(self):
@@ -34,7 +39,59 @@ class GeneratorThread(QThread):
                 self.style,
                 lambda current, total: self.progress.emit(current, total)
             )
-            self.finished.emit(results)
+            if len(results) != len(self.items):
+                raise ValueError(f"Expected {len(self.items)} results, got {len(results)}")
+
+            # Pair each result with its item's key, checking they belong together
+            keyed_results = []
+            for key, item, result in zip(self.keys, self.items, results):
+                if result.get('name') != item['name']:
+                    raise ValueError(f"Result for {result.get('name')} returned in place of {item['name']}")
+                keyed_results.append((key, result))
+            self.finished.emit(keyed_results)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class ValidatorThread(QThread):
+    """Thread for validating generated docstrings."""
+
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(list, list, int)
+    error = pyqtSignal(str)
+
+    def __init__(self, validator, results):
+        """Initialize the ValidatorThread."""
+        super().__init__()
+        self.validator = validator
+        self.results = results
+
+    def run(self):
+        """Run the validation process."""
+        try:
+            total_violations = 0
+            all_violations = []
+            ui_rows = []
+
+            for index, result in enumerate(self.results, 1):
+                docstring = result['generated_docstring']
+                name = result['name']
+
+                # Validate this docstring
+                validation_result = self.validator.validate_docstring(docstring, name)
+
+                if validation_result.get('total_violations', 0) > 0:
+                    total_violations += validation_result['total_violations']
+
+                    for violation in validation_result.get('violations', []):
+                        all_violations.append(violation)
+                        ui_rows.append(f"❌ {name}: {violation['code']} - {violation['message']}")
+                else:
+                    ui_rows.append(f"✓ {name}: PEP 257 compliant")
+
+                self.progress.emit(index, len(self.results))
+
+            self.finished.emit(ui_rows, all_violations, total_violations)
         except Exception as e:
             self.error.emit(str(e))
 
@@ -51,6 +108,13 @@ class ValidatorTab(QWidget):
         self.current_style = "Google"
         self.generated_results = []
         self.generated_code = ""
+        # Successful generation results keyed by
+        # (name, first line, last line, SHA-256 of the item source, style)
+        self._gen_cache = {}
+        self._gen_keys = []
+        # Download text for the last generation and the style it was rendered in
+        self._download_output = ""
+        self._download_style = None
         self.init_ui()
 
     def init_ui(self):
@@ -60,8 +124,8 @@ class ValidatorTab(QWidget):
         # API Key input
         api_layout = QHBoxLayout()
         api_label = QLabel("Gemini API Key:")
-        self.api_key_input = QTextEdit()
-        self.api_key_input.setMaximumHeight(60)
+        self.api_key_input = QLineEdit()
+        self.api_key_input.setEchoMode(QLineEdit.Password)
         self.api_key_input.setPlaceholderText("Enter your Gemini API key here...")
 
         api_set_btn = QPushButton("Set API Key")
@@ -105,10 +169,12 @@ class ValidatorTab(QWidget):
             rb = QRadioButton(style)
             if style == "Google":
                 rb.setChecked(True)
-            rb.toggled.connect(lambda checked, s=style: self.change_style(s, checked))
             self.style_buttons.addButton(rb)
             style_layout.addWidget(rb)
 
+        # One signal per click, carrying the newly selected button
+        self.style_buttons.buttonClicked.connect(lambda button: self.change_style(button.text(), True))
+
         self.style_status_label = QLabel("Status: Ready")
         style_layout.addWidget(self.style_status_label)
 
@@ -168,7 +234,7 @@ class ValidatorTab(QWidget):
         docstring_label.setObjectName("subHeaderLabel")
         layout.addWidget(docstring_label)
 
-        self.docstring_output = QTextEdit()
+        self.docstring_output = QPlainTextEdit()
         self.docstring_output.setReadOnly(True)
         self.docstring_output.setPlaceholderText("Generated docstrings will appear here...")
         layout.addWidget(self.docstring_output)
@@ -186,7 +252,7 @@ class ValidatorTab(QWidget):
 
     def set_api_key(self):
         """Set the Gemini API key."""
-        api_key = self.api_key_input.toPlainText().strip()
+        api_key = self.api_key_input.text().strip()
 
         if not api_key:
             QMessageBox.warning(self, "Warning", "Please enter an API key.")
@@ -237,14 +303,39 @@ class ValidatorTab(QWidget):
             )
             return
 
+        # Only items not generated before in this style go to the API
+        self._gen_keys = [
+            (
+                item['name'],
+                item['line'],
+                item['line_end'],
+                hashlib.sha256(self.parser_tab.get_item_source(item).encode('utf-8')).hexdigest(),
+                self.current_style
+            )
+            for item in all_items
+        ]
+        pending = [
+            (item, key) for item, key in zip(all_items, self._gen_keys)
+            if key not in self._gen_cache
+        ]
+
+        if not pending:
+            self.generation_finished([])
+            return
+
         # Start generation
         self.generate_btn.setEnabled(False)
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
-        self.progress_bar.setMaximum(len(all_items))
+        self.progress_bar.setMaximum(len(pending))
 
         # Create and start thread
-        self.gen_thread = GeneratorThread(self.generator, all_items, self.current_style)
+        self.gen_thread = GeneratorThread(
+            self.generator,
+            [item for item, _ in pending],
+            [key for _, key in pending],
+            self.current_style
+        )
         self.gen_thread.progress.connect(self.update_progress)
         self.gen_thread.finished.connect(self.generation_finished)
         self.gen_thread.error.connect(self.generation_error)
@@ -254,29 +345,31 @@ class ValidatorTab(QWidget):
         """Update the progress bar."""
         self.progress_bar.setValue(current)
 
-    def generation_finished(self, results):
+    def generation_finished(self, keyed_results):
         """Handle generation completion."""
-        self.generated_results = results
-        self.progress_bar.setVisible(False)
-        self.generate_btn.setEnabled(True)
+        fresh = dict(keyed_results)
 
-        # Display results
-        output = f"Generated Docstrings ({self.current_style} style)\n"
-        output += "=" * 60 + "\n\n"
+        # Only cache successes, so failed items (e.g. rate limited) are retried next time
+        for key, result in keyed_results:
+            failed = result.get('error') or result.get('status') == 'error'
+            if result.get('generated_docstring') and not failed:
+                self._gen_cache[key] = result
 
-        for result in results:
-            output += f"Function/Class: {result['name']}\n"
-            output += "-" * 60 + "\n"
+        # Merge the new results with the cached ones, in parsed order
+        results = []
+        for key in self._gen_keys:
+            result = fresh.get(key) or self._gen_cache.get(key)
+            if result is not None:
+                results.append(result)
 
-            if result['has_original']:
-                output += "Original Docstring:\n"
-                output += result['original_docstring'] + "\n\n"
-
-            output += "Generated Docstring:\n"
-            output += result['generated_docstring'] + "\n"
-            output += "=" * 60 + "\n\n"
+        self.generated_results = results
+        self.progress_bar.setVisible(False)
+        self.generate_btn.setEnabled(True)
 
-        self.docstring_output.setPlainText(output)
+        # Display results, keeping the download text rendered alongside
+        display_output, self._download_output = self.render_output()
+        self._download_style = self.current_style
+        self.docstring_output.setPlainText(display_output)
 
         # Enable validation
         self.validate_btn.setEnabled(True)
@@ -304,34 +397,29 @@ class ValidatorTab(QWidget):
             QMessageBox.warning(self, "No Data", "Please generate docstrings first.")
             return
 
-        # Get original code
-        parsed_data = self.parser_tab.get_parsed_data()
-        original_code = self.parser_tab.current_code
-
-        # Build new code with generated docstrings
         # For simplicity, we'll validate each docstring individually
-        self.validation_output.clear()
-
-        total_violations = 0
-        all_violations = []
-
-        for result in self.generated_results:
-            docstring = result['generated_docstring']
-            name = result['name']
+        self.validate_btn.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setMaximum(len(self.generated_results))
 
-            # Validate this docstring
-            validation_result = self.validator.validate_docstring(docstring, name)
+        # Validate in a thread so the UI stays responsive
+        self.val_thread = ValidatorThread(self.validator, self.generated_results)
+        self.val_thread.progress.connect(self.update_progress)
+        self.val_thread.finished.connect(self.validation_finished)
+        self.val_thread.error.connect(self.validation_error)
+        self.val_thread.start()
 
-            if validation_result.get('total_violations', 0) > 0:
-                total_violations += validation_result['total_violations']
+    def validation_finished(self, ui_rows, all_violations, total_violations):
+        """Handle validation completion."""
+        self.progress_bar.setVisible(False)
+        self.validate_btn.setEnabled(True)
 
-                for violation in validation_result.get('violations', []):
-                    all_violations.append(violation)
-                    self.validation_output.addItem(
-                        f"❌ {name}: {violation['code']} - {violation['message']}"
-                    )
-            else:
-                self.validation_output.addItem(f"✓ {name}: PEP 257 compliant")
+        # Show all rows in one call with repaints paused
+        self.validation_output.setUpdatesEnabled(False)
+        self.validation_output.clear()
+        self.validation_output.addItems(ui_rows)
+        self.validation_output.setUpdatesEnabled(True)
 
         # Update statistics
         total_items = len(self.generated_results)
@@ -357,6 +445,44 @@ class ValidatorTab(QWidget):
                 f"Found {total_violations} PEP 257 violations.\nCheck the validation results for details."
             )
 
+    def validation_error(self, error_msg):
+        """Handle validation error."""
+        self.progress_bar.setVisible(False)
+        self.validate_btn.setEnabled(True)
+
+        QMessageBox.critical(
+            self,
+            "Validation Error",
+            f"Failed to validate docstrings:\n{error_msg}"
+        )
+
+    def render_output(self):
+        """
+        Render the generated docstrings for display and download in one pass.
+
+        The download text is the display text without the original docstrings.
+
+        Returns:
+            Tuple of (display text, download text)
+        """
+        header = f"Generated Docstrings ({self.current_style} style)\n" + "=" * 60 + "\n\n"
+        display_parts = [header]
+        download_parts = [header]
+
+        for result in self.generated_results:
+            title = f"Function/Class: {result['name']}\n" + "-" * 60 + "\n\n"
+            generated = f"Generated Docstring:\n{result['generated_docstring']}\n" + "=" * 60 + "\n\n"
+
+            display_parts.append(title)
+            if result['has_original']:
+                display_parts.append(f"Original Docstring:\n{result['original_docstring']}\n\n")
+            display_parts.append(generated)
+
+            download_parts.append(title)
+            download_parts.append(generated)
+
+        return "".join(display_parts), "".join(download_parts)
+
     def download_output(self):
         """Download the generated output."""
         if not self.generated_results:
@@ -375,18 +501,13 @@ class ValidatorTab(QWidget):
             return
 
         try:
-            # Write output
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"Generated Docstrings ({self.current_style} style)\n")
-                f.write("=" * 60 + "\n\n")
-
-                for result in self.generated_results:
-                    f.write(f"Function/Class: {result['name']}\n")
-                    f.write("-" * 60 + "\n\n")
-
-                    f.write("Generated Docstring:\n")
-                    f.write(result['generated_docstring'] + "\n")
-                    f.write("=" * 60 + "\n\n")
+            # Rendered with the display; only a style change since needs a new header
+            if self._download_style != self.current_style:
+                _, self._download_output = self.render_output()
+                self._download_style = self.current_style
+
+            # Write output in a single call
+            Path(file_path).write_text(self._download_output, encoding='utf-8')
 
             QMessageBox.information(
                 self,
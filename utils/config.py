@@ -5,19 +5,33 @@ Configuration settings for the Docstring Generator application.
 import os
 
 # API Configuration
-GEMINI_API_KEY = os.getenv("set_your_own_api_key",)  # Set your API key here or as environment variable
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")  # Set your API key here or as environment variable
 
 # Docstring Styles
-DOCSTRING_STYLES = {
-    "Google": "Google style docstring format",
-    "NumPy": "NumPy/SciPy style docstring format",
-    "reST": "reStructuredText style docstring format"
-}
+DOCSTRING_STYLES = ("Google", "NumPy", "reST")
 
 # Model Configuration
 GEMINI_MODEL = "gemini-2.5-flash"
 
+# Batch Generation Configuration
+GEMINI_MAX_CONCURRENCY = 8  # Maximum in-flight requests during batch generation
+GEMINI_REQUESTS_PER_MINUTE = 60  # Adjust to match your Gemini quota tier
+GEMINI_MAX_RETRIES = 5  # Retries on rate-limit (429) and server (5xx) errors
+GEMINI_BATCH_SIZE = 8  # Functions packed into a single prompt
+
+# Response Cache Configuration
+CACHE_BACKEND = "sqlite"  # "sqlite" or "json"
+CACHE_PATH = ".docstring_cache.db"
+CACHE_TTL = None  # Entry lifetime in seconds, None to keep forever
+
+# Semantic Cache Configuration
+SEMANTIC_CACHE_ENABLED = False  # Reuse results for near-duplicate functions; costs an embedding call per cache miss
+SEMANTIC_CACHE_PATH = ".docstring_semantic_cache"
+SEMANTIC_CACHE_THRESHOLD = 0.97  # Minimum cosine similarity for a hit
+GEMINI_EMBEDDING_MODEL = "models/text-embedding-004"
+
 # UI Configuration
 WINDOW_TITLE = "Python Docstring Generator"
 WINDOW_WIDTH = 1400
-WINDOW_HEIGHT = 900
\ No newline at end of file
+WINDOW_HEIGHT = 900
+LARGE_FILE_SIZE = 4 * 1024 * 1024  # Bytes above which uploads are memory-mapped
\ No newline at end of file
@@ -1,5 +1,18 @@
 """Helper utilities for the application."""
 
+import io
+import re
+
+# Start of a function or class definition line
+_DEF_RE = re.compile(r'^\s*(?:async\s+)?(?:def|class)\s+[A-Za-z_]\w*')
+
+# Opening quotes of a docstring
+_TRIPLE_QUOTES = ('"""', "'''")
+
+# Severity by pydocstyle code prefix:
+# D1xx missing docstrings, D2xx whitespace, D3xx quotes, D4xx content
+_SEVERITY = {'D1': 'error', 'D2': 'warning', 'D3': 'warning', 'D4': 'error'}
+
 
 def format_code_with_docstring(original_code, docstring, indent_level=1):
     """
@@ -18,7 +31,7 @@ def format_code_with_docstring(original_code, docstring, indent_level=1):
     # Find the function/class definition line
     def_line_idx = 0
     for i, line in enumerate(lines):
-        if line.strip().startswith('def ') or line.strip().startswith('class '):
+        if _DEF_RE.match(line):
             def_line_idx = i
             break
 
@@ -26,10 +39,10 @@ def format_code_with_docstring(original_code, docstring, indent_level=1):
     indent = '    ' * indent_level
 
     # Format docstring
-    formatted_docstring = f'{indent}"""\n'
-    for line in docstring.split('\n'):
-        formatted_docstring += f'{indent}{line}\n'
-    formatted_docstring += f'{indent}"""'
+    docstring_lines = [f'{indent}"""']
+    docstring_lines.extend(f'{indent}{line}' for line in docstring.split('\n'))
+    docstring_lines.append(f'{indent}"""')
+    formatted_docstring = '\n'.join(docstring_lines)
 
     # Insert docstring after the definition line
     result_lines = lines[:def_line_idx + 1]
@@ -41,7 +54,7 @@ def format_code_with_docstring(original_code, docstring, indent_level=1):
         line = lines[i].strip()
 
         # Skip existing docstring
-        if line.startswith('"""') or line.startswith("'''"):
+        if line.startswith(_TRIPLE_QUOTES):
             if line.count('"""') == 2 or line.count("'''") == 2:
                 # Single line docstring
                 continue
@@ -59,30 +72,60 @@ def format_code_with_docstring(original_code, docstring, indent_level=1):
     return '\n'.join(result_lines)
 
 
-def get_severity_color(code):
+def insert_docstrings_into_code(source_code, functions, docstrings):
     """
-    Get color for violation severity.
+    Insert generated docstrings into source code.
+
+    Each docstring goes in front of the function's first body statement,
+    replacing an existing docstring, so signature lines are never touched.
 
     Args:
-        code: Error code from pydocstyle
+        source_code: The Python source code
+        functions: FunctionInfo objects parsed from `source_code`, in source order
+        docstrings: Generation results keyed by function name
 
     Returns:
-        Color name for the severity
+        Source code with the generated docstrings in place
     """
-    # D1xx: Missing docstrings
-    if code.startswith('D1'):
-        return 'error'
+    # Split on newlines only, like the parser's line numbers, keeping the ends
+    lines = io.StringIO(source_code).readlines()
+    output = io.StringIO()
+    # Index of the next source line to copy
+    pos = 0
+
+    # Functions come in source order, so the output is built by copying the
+    # slices between their bodies and jumping over old docstrings
+    for func in functions:
+        result = docstrings.get(func.name)
+        if not result or result.get('status') not in ('generated', 'semantic-cache'):
+            continue
+
+        docstring = result.get('docstring', '')
+        start = func.body_lineno - 1
+        # A body on the header line leaves no line to insert before
+        if not docstring or start < pos or func.body_lineno == func.lineno:
+            continue
 
-    # D2xx: Whitespace issues
-    if code.startswith('D2'):
-        return 'warning'
+        output.writelines(lines[pos:start])
+        indent_str = lines[start][:func.body_col_offset]
+        body = '\n'.join(indent_str + doc_line for doc_line in docstring.split('\n'))
+        output.write(f'{indent_str}"""\n{body}\n{indent_str}"""\n')
 
-    # D3xx: Quotes issues
-    if code.startswith('D3'):
-        return 'warning'
+        # Drop the old docstring, or keep the first statement
+        pos = func.docstring_end_lineno if func.docstring_end_lineno is not None else start
 
-    # D4xx: Docstring content issues
-    if code.startswith('D4'):
-        return 'error'
+    output.writelines(lines[pos:])
+    return output.getvalue()
 
-    return 'error'
+
+def get_severity_color(code):
+    """
+    Get color for violation severity.
+
+    Args:
+        code: Error code from pydocstyle
+
+    Returns:
+        Color name for the severity
+    """
+    return _SEVERITY.get(code[:2], 'error')